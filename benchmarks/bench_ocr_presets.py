@@ -0,0 +1,83 @@
+"""OCR presetlərinin dəqiqlik/gecikmə müqayisəsi.
+
+İstifadə:
+    python -m benchmarks.bench_ocr_presets <qovluq> [--presets fast balanced accurate]
+
+Qovluqda hər `cv.pdf` faylının yanında onun düzgün mətni `cv.txt` olmalıdır.
+Mətn qatı və keş istifadə olunmur, yalnız render + hazırlıq + OCR ölçülür.
+"""
+import argparse
+import difflib
+import glob
+import os
+import re
+import statistics
+import time
+
+from src.config.settings import OCR_PRESETS
+from src.utils.pdf_processor import PDFDocument, PDFProcessor
+
+
+def _words(text: str) -> list:
+    return re.findall(r"\w+", text.lower())
+
+
+def word_accuracy(reference: str, hypothesis: str) -> float:
+    """Söz ardıcıllığının oxşarlığı (0-1)"""
+    return difflib.SequenceMatcher(None, _words(reference), _words(hypothesis), autojunk=False).ratio()
+
+
+def run_preset(preset: str, samples: list) -> dict:
+    processor = PDFProcessor(preset=preset)
+    latencies = []
+    accuracies = []
+
+    for pdf_path, reference in samples:
+        with open(pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+
+        start = time.perf_counter()
+        document = PDFDocument(pdf_bytes, processor.ocr_dpi, processor.poppler_path)
+        images = document.render(list(range(1, document.page_count + 1)))
+        text = "\n".join(processor._ocr_pages(images))
+        latencies.append(time.perf_counter() - start)
+        accuracies.append(word_accuracy(reference, text))
+
+    return {
+        "preset": preset,
+        "dpi": processor.ocr_dpi,
+        "psm": processor.preset_options["psm"],
+        "mean_s": statistics.mean(latencies),
+        "p95_s": sorted(latencies)[int(0.95 * (len(latencies) - 1))],
+        "accuracy": statistics.mean(accuracies)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR preset benchmark")
+    parser.add_argument("directory", help="PDF və uyğun .txt faylları olan qovluq")
+    parser.add_argument("--presets", nargs="+", default=list(OCR_PRESETS.keys()))
+    args = parser.parse_args()
+
+    samples = []
+    for pdf_path in sorted(glob.glob(os.path.join(args.directory, "*.pdf"))):
+        txt_path = os.path.splitext(pdf_path)[0] + ".txt"
+        if os.path.exists(txt_path):
+            with open(txt_path, encoding="utf-8") as f:
+                samples.append((pdf_path, f.read()))
+
+    if not samples:
+        raise SystemExit("Qovluqda PDF + .txt cütü tapılmadı")
+
+    print(f"{len(samples)} sənəd")
+    print(f"{'preset':<10} {'dpi':>4} {'psm':>4} {'mean s':>8} {'p95 s':>8} {'accuracy':>9}")
+    for preset in args.presets:
+        row = run_preset(preset, samples)
+        print(
+            f"{row['preset']:<10} {row['dpi']:>4} {row['psm']:>4} "
+            f"{row['mean_s']:>8.2f} {row['p95_s']:>8.2f} {row['accuracy']:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
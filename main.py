@@ -1,18 +1,19 @@
 import streamlit as st
 import asyncio
 import logging
-from datetime import datetime, timedelta
-import pytz
+import time
 from src.config.constants import UI_TEXTS, ROLE_REQUIREMENTS
 from src.utils.session import SessionManager
 from src.core.groq_agent import GroqAgent
 from src.core.email_handler import EmailHandler
 from src.utils.pdf_processor import PDFProcessor
+from src.utils.document_ingestion import DocumentIngestor
 from src.ui.components import UIComponents
 from src.core.zoom_handler import CustomZoomTool
-from dotenv import load_dotenv
+from src.core.interview_scheduler import get_slot_allocator
+from src.config.settings import COMBINED_ANALYSIS, TIMEZONE
+from src.utils.resources import get_async_runner, get_session_resource, registry, run_async
 import os
-load_dotenv()
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -24,23 +25,43 @@ class ApplicationManager:
         self.session_manager = SessionManager()
         self.ui_components = UIComponents()
         self.pdf_processor = PDFProcessor()
+        self.document_ingestor = DocumentIngestor(self.pdf_processor)
+        self.slot_allocator = get_slot_allocator()
+
+    def close(self):
+        self.pdf_processor.close()
         
     def initialize_agents(self):
-        """API açarlarının yoxlanması və agent obyektlərinin yaradılması"""
+        """API açarlarının yoxlanması və agent obyektlərinin yaradılması.
+
+        Agentlər etimadnaməyə görə proses səviyyəsində paylaşılır; sidebar-da
+        açar dəyişdikdə köhnəsi bağlanır və yenisi yaradılır.
+        """
         if not st.session_state['groq_api_key']:
             st.sidebar.error("Zəhmət olmasa Groq API açarını daxil edin!")
             return None, None
 
         try:
-            groq_agent = GroqAgent(st.session_state['groq_api_key'])
-            email_handler = EmailHandler()
+            groq_agent = get_session_resource(
+                "groq_agent",
+                (st.session_state['groq_api_key'],),
+                lambda: GroqAgent(st.session_state['groq_api_key']),
+                # Klient fon loop-unda yaradıldığı üçün orada da bağlanır
+                lambda agent: run_async(agent.aclose())
+            )
+            email_handler = get_session_resource(
+                "email_handler",
+                (st.session_state.get('email_address'), st.session_state.get('email_password')),
+                EmailHandler,
+                lambda handler: handler.session.close()
+            )
             return groq_agent, email_handler
         except Exception as e:
             logger.error(f"Agent initialization error: {str(e)}")
             st.error("Agent obyektlərinin yaradılması zamanı xəta!")
             return None, None
 
-    def process_resume(self, resume_file, groq_agent):
+    def process_resume(self, resume_file, groq_agent, role):
         """CV faylının emalı və təhlili"""
         if not resume_file:
             return False
@@ -49,7 +70,7 @@ class ApplicationManager:
         
         try:
             
-            preview = self.pdf_processor.get_pdf_preview(resume_file)
+            preview = self.document_ingestor.get_preview(resume_file)
             if preview:
                 st.image(preview, caption="CV Görüntüsü", use_column_width=True)
            
@@ -57,21 +78,42 @@ class ApplicationManager:
 
             if not st.session_state['resume_text']:
                 with st.spinner("CV-niz emal olunur..."):
-                    resume_text = self.pdf_processor.extract_text(resume_file)
+                    progress = st.progress(0.0)
+                    resume_text = self.document_ingestor.extract_text(
+                        resume_file,
+                        on_page=lambda page_no, page_count: progress.progress(
+                            page_no / page_count, text=f"Səhifə {page_no}/{page_count}"
+                        )
+                    )
+                    progress.empty()
                     if resume_text:
                         st.session_state['resume_text'] = resume_text
                         st.success("CV uğurla emal edildi!")
 
-                        # email unvani cixar
-                        email_from_resume = asyncio.run(groq_agent.extract_email(resume_text))
+                        # əlaqə məlumatlarını çıxar (LLM yalnız lazım olduqda)
+                        if COMBINED_ANALYSIS:
+                            # Email lokal tapılmasa təhlil də elə indi, eyni sorğuda aparılır
+                            contacts, analysis = run_async(
+                                groq_agent.extract_contacts_with_analysis(resume_text, role)
+                            )
+                            if analysis:
+                                st.session_state['pending_analysis'] = {'role': role, 'result': analysis}
+                        else:
+                            contacts = run_async(groq_agent.extract_contacts(resume_text))
+                        st.session_state['candidate_contacts'] = contacts
+                        email_from_resume = contacts.get('email')
                         if email_from_resume:
                             st.session_state['candidate_email'] = email_from_resume
                             st.success(f"Email ünvanı tapıldı: {email_from_resume}")
                         else:
                             st.warning("CV-dən email ünvanı tapılmadı.")
+
+                        extra_contacts = contacts.get('phones', []) + contacts.get('linkedin', []) + contacts.get('github', [])
+                        if extra_contacts:
+                            st.caption("Digər əlaqə məlumatları: " + ", ".join(extra_contacts))
                         return True
                     else:
-                        st.error("PDF emal edilə bilmədi.")
+                        st.error("Fayl emal edilə bilmədi.")
                         return False
 
             return True
@@ -94,38 +136,50 @@ class ApplicationManager:
                 st.error("Zoom tənzimləmələrini tamamlayın!")
                 return False
 
-            baku_tz = pytz.timezone('Asia/Baku')
-            current_time = datetime.now(baku_tz)
-            next_workday = current_time + timedelta(days=1)
-            
-            if next_workday.weekday() >= 5:
-                next_workday += timedelta(days=8 - next_workday.weekday())
-
-            interview_time = next_workday.replace(hour=11, minute=0, second=0, microsecond=0)
-
-            zoom_tool = CustomZoomTool(**zoom_configs)
-            
-            meeting_details = {
-                "topic": f"{role} Texniki Müsahibə",
-                "start_time": interview_time.strftime("%Y-%m-%dT%H:%M:%S"),
-                "duration": 60,
-                "timezone": "Asia/Baku"
-            }
+            candidate_email = st.session_state.get('candidate_email')
+            if not candidate_email:
+                return False
 
-            meeting_response = await zoom_tool.create_meeting(meeting_details)
-            
-            if st.session_state.get('candidate_email'):
-                await email_handler.send_interview_confirmation(
-                    to_email=st.session_state['candidate_email'],
-                    role=role,
-                    meeting_details={
-                        "date": interview_time.strftime("%Y-%m-%d"),
-                        "time": interview_time.strftime("%H:%M"),
-                        "join_url": meeting_response.get("join_url")
-                    }
+            # Boş slot ayrılır; təkrar klikdə eyni rezervasiya qaytarılır
+            booking = self.slot_allocator.allocate_one(candidate_email, role)
+            if booking is None:
+                st.error("Yaxın günlərdə boş müsahibə vaxtı qalmayıb!")
+                return False
+            interview_time = booking["start"]
+
+            if booking["join_url"]:
+                meeting_response = {"join_url": booking["join_url"], "meeting_id": booking["meeting_id"]}
+            else:
+                zoom_tool = CustomZoomTool(**zoom_configs)
+
+                meeting_details = {
+                    "topic": f"{role} Texniki Müsahibə",
+                    "start_time": interview_time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "duration": int((booking["end"] - booking["start"]).total_seconds() // 60),
+                    "timezone": TIMEZONE
+                }
+
+                try:
+                    meeting_response = await zoom_tool.create_meeting(meeting_details)
+                except Exception:
+                    # Görüş yaradılmadısa slot başqa namizəd üçün azad edilir
+                    self.slot_allocator.release(booking["id"])
+                    raise
+                self.slot_allocator.attach_meeting(
+                    booking["id"], meeting_response.get("meeting_id"), meeting_response.get("join_url")
                 )
-                return True
-            return False
+
+            email_handler.enqueue_interview_confirmation(
+                to_email=candidate_email,
+                role=role,
+                meeting_details={
+                    "date": interview_time.strftime("%Y-%m-%d"),
+                    "time": interview_time.strftime("%H:%M"),
+                    "join_url": meeting_response.get("join_url")
+                },
+                booking_id=booking["id"]
+            )
+            return True
 
         except Exception as e:
             logger.error(f"Interview scheduling error: {str(e)}")
@@ -185,30 +239,69 @@ def render_sidebar():
         st.session_state['zoom_client_secret'] = client_secret
 
 def display_analysis_results(analysis_result):
-    """Təhlil nəticələrini göstərmək üçün helper funksiya"""
+    """Təhlil nəticələrini göstərmək üçün helper funksiya (axın zamanı natamam nəticə də ola bilər)"""
     if not analysis_result:
         return
         
+    if analysis_result.get('ilkin_seçim'):
+        st.caption("Nəticə lokal ilkin seçim ilə, AI təhlili olmadan verilib.")
+
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Uyğunluq", f"{analysis_result['uyğunluq_faizi']}%")
+        st.metric("Uyğunluq", f"{analysis_result['uyğunluq_faizi']}%" if 'uyğunluq_faizi' in analysis_result else "...")
     with col2:
-        st.metric("Qərar", analysis_result['qərar'].upper())
+        st.metric("Qərar", str(analysis_result['qərar']).upper() if 'qərar' in analysis_result else "...")
 
     with st.expander("Ətraflı Təhlil", expanded=True):
-        st.write(analysis_result['təhlil'])
+        st.write(analysis_result.get('təhlil', "Təhlil hazırlanır..."))
         
-        st.write("**Güclü tərəflər:**")
-        for strength in analysis_result['güclü_tərəflər']:
-            st.write(f"- {strength}")
-        
-        st.write("**İnkişaf tələb edən sahələr:**")
-        for weakness in analysis_result['zəif_tərəflər']:
-            st.write(f"- {weakness}")
-        
-        st.write("**Məsləhətlər:**")
-        for suggestion in analysis_result['məsləhətlər']:
-            st.write(f"- {suggestion}")
+        sections = [
+            ("**Güclü tərəflər:**", 'güclü_tərəflər'),
+            ("**İnkişaf tələb edən sahələr:**", 'zəif_tərəflər'),
+            ("**Məsləhətlər:**", 'məsləhətlər')
+        ]
+        for title, key in sections:
+            if key not in analysis_result:
+                continue
+            st.write(title)
+            items = analysis_result[key]
+            for item in (items if isinstance(items, list) else [items]):
+                st.write(f"- {item}")
+
+DELIVERY_STATUS_LABELS = {
+    "pending": "⏳ Növbədə",
+    "sending": "📤 Göndərilir",
+    "sent": "✅ Göndərildi",
+    "failed": "❌ Göndərilə bilmədi"
+}
+
+def display_delivery_status(email_handler, email):
+    """Namizədə göndərilən emaillərin outbox vəziyyətini göstərir"""
+    records = email_handler.delivery_status(email)
+    if not records:
+        return
+
+    with st.expander("Email göndərişləri", expanded=False):
+        for record in records:
+            line = f"{DELIVERY_STATUS_LABELS.get(record['status'], record['status'])} — {record['subject']}"
+            if record['status'] != "sent" and record['last_error']:
+                line += f" (cəhd {record['attempts']}: {record['last_error']})"
+            st.write(line)
+        st.button("Vəziyyəti yenilə", key="refresh_delivery_status")
+
+def stream_analysis(groq_agent, resume_text, role):
+    """Təhlili axınla alır; bal və qərar hazır olan kimi göstərilir.
+
+    Sorğu fon loop-unda gedir, UI isə skript thread-ində yenilənir.
+    """
+    placeholder = st.empty()
+    analysis_result = {}
+    for partial in get_async_runner().iterate(groq_agent.analyze_resume_stream(resume_text, role)):
+        analysis_result = partial
+        with placeholder.container():
+            display_analysis_results(partial)
+    placeholder.empty()
+    return analysis_result
 
 def main():
     try:
@@ -219,9 +312,12 @@ def main():
         
         render_sidebar()
         
-        app = ApplicationManager()
+        rerun_start = time.perf_counter()
+        # PDF prosessoru, OCR işçiləri və slot bölüşdürücüsü etimadnamədən asılı deyil
+        app = registry.get("application_manager", "", ApplicationManager, ApplicationManager.close)
         
         groq_agent, email_handler = app.initialize_agents()
+        logger.info(f"Rerun setup overhead: {(time.perf_counter() - rerun_start) * 1000:.1f} ms")
         if not groq_agent or not email_handler:
             return
 
@@ -238,13 +334,13 @@ def main():
             st.experimental_rerun()
 
         resume_file = st.file_uploader(
-            "CV-nizi yükləyin (PDF)",
-            type=["pdf"],
+            "CV-nizi yükləyin (PDF, DOCX və ya TXT)",
+            type=DocumentIngestor.SUPPORTED_TYPES,
             key="resume_uploader"
         )
 
         if resume_file:
-            app.process_resume(resume_file, groq_agent)
+            app.process_resume(resume_file, groq_agent, role)
 
         email = st.text_input(
             "Namizədin email ünvanı",
@@ -257,48 +353,60 @@ def main():
         if st.session_state.get('analysis_result'):
             display_analysis_results(st.session_state['analysis_result'])
 
+        display_delivery_status(email_handler, email)
+
         # CV təhlili
         if st.session_state['resume_text'] and email and not st.session_state['analysis_complete']:
             if st.button("CV-ni Təhlil Et"):
                 with st.spinner("CV-niz təhlil olunur..."):
                     try:
-                        analysis_result = asyncio.run(groq_agent.analyze_resume(
-                            st.session_state['resume_text'],
-                            role
-                        ))
+                        pending = st.session_state.get('pending_analysis')
+                        if pending and pending['role'] == role:
+                            # Təhlil əlaqə məlumatları ilə birlikdə artıq alınıb
+                            analysis_result = pending['result']
+                        else:
+                            analysis_result = stream_analysis(
+                                groq_agent,
+                                st.session_state['resume_text'],
+                                role
+                            )
                      
                        
-                        st.session_state['analysis_result'] = analysis_result
+                        if analysis_result.get("xəta"):
+                            # Texniki xəta (məs. limit aşımı) rədd qərarı sayılmır, email göndərilmir
+                            st.error("CV təhlili müvəqqəti mümkün olmadı. Zəhmət olmasa bir az sonra yenidən cəhd edin.")
+                        else:
+                            st.session_state['analysis_result'] = analysis_result
                         
-                        with st.expander("CV Mətni", expanded=False):
-                            st.text_area(
-                                "Çıxarılmış CV Mətni",
-                                st.session_state['resume_text'],
-                                height=300,
-                                disabled=True
-                            )
+                            with st.expander("CV Mətni", expanded=False):
+                                st.text_area(
+                                    "Çıxarılmış CV Mətni",
+                                    st.session_state['resume_text'],
+                                    height=300,
+                                    disabled=True
+                                )
 
-                        display_analysis_results(analysis_result)
+                            display_analysis_results(analysis_result)
 
-                        is_selected = analysis_result.get("qərar") == "qəbul"
+                            is_selected = analysis_result.get("qərar") == "qəbul"
                         
-                        if is_selected:
-                            st.success("Təbriklər! Sizin bacarıqlarınız tələblərə uyğundur.")
-                            st.session_state['analysis_complete'] = True
-                            st.session_state['is_selected'] = True
-                            st.experimental_rerun()
-                        else:
-                            st.warning("Təəssüf ki, sizin bacarıqlarınız hal-hazırda tələblərə tam uyğun deyil.")
+                            if is_selected:
+                                st.success("Təbriklər! Sizin bacarıqlarınız tələblərə uyğundur.")
+                                st.session_state['analysis_complete'] = True
+                                st.session_state['is_selected'] = True
+                                st.experimental_rerun()
+                            else:
+                                st.warning("Təəssüf ki, sizin bacarıqlarınız hal-hazırda tələblərə tam uyğun deyil.")
                             
-                            with st.spinner("Rəy emaili göndərilir..."):
                                 try:
-                                    asyncio.run(email_handler.send_rejection_email(
+                                    # Email növbəyə yazılır, göndərişi fon işçisi edir
+                                    email_handler.enqueue_rejection_email(
                                         to_email=email,
                                         role=role,
                                         feedback=analysis_result['təhlil'],
                                         suggestions=analysis_result.get("məsləhətlər", [])
-                                    ))
-                                    st.info("Sizə ətraflı rəy emaili göndərildi.")
+                                    )
+                                    st.info("Sizə ətraflı rəy emaili göndəriləcək.")
                                 except Exception as e:
                                     logger.error(f"Rejection email error: {str(e)}")
                                     st.error("Email göndərilə bilmədi.")
@@ -315,20 +423,21 @@ def main():
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    with st.spinner("📧 Təsdiq emaili göndərilir..."):
-                        try:
-                            asyncio.run(email_handler.send_selection_email(
-                                to_email=st.session_state['candidate_email'],
-                                role=role
-                            ))
-                            st.success("✅ Təsdiq emaili göndərildi!")
-                        except Exception as e:
-                            st.error("❌ Email göndərilməsi xətası!")
-                            logger.error(f"Selection email error: {str(e)}")
+                    try:
+                        email_handler.enqueue_selection_email(
+                            to_email=st.session_state['candidate_email'],
+                            role=role
+                        )
+                        st.success("✅ Təsdiq emaili növbəyə əlavə edildi!")
+                    except Exception as e:
+                        st.error("❌ Email göndərilməsi xətası!")
+                        logger.error(f"Selection email error: {str(e)}")
                 
                 with col2:
                     with st.spinner("📅 Müsahibə planlaşdırılır..."):
                         try:
+                            # st.error çağırışları skript thread-ində qalsın deyə fon loop-u istifadə olunmur;
+                            # Zoom tokeni və HTTP hovuzu onsuz da proses səviyyəsində paylaşılır
                             if asyncio.run(app.schedule_interview(role, email_handler)):
                                 st.success("✅ Müsahibə planlaşdırıldı!")
                             else:
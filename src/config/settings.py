@@ -1,4 +1,6 @@
 import os
+import shutil
+from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,4 +18,156 @@ DEFAULT_MODEL = "llama-3.3-70b-versatile"
 MAX_TOKENS = 2500
 TEMPERATURE = 0.7
 
-TIMEZONE = "Asia/Baku"
\ No newline at end of file
+TIMEZONE = "Asia/Baku"
+
+# OCR tənzimləmələri
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+# Paralel OCR üçün işçi sayı (1 = ardıcıl emal)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", min(4, os.cpu_count() or 1)))
+TESSERACT_CMD = os.getenv("TESSERACT_PATH") or shutil.which("tesseract") or "tesseract"
+POPPLER_PATH = os.getenv("POPPLER_PATH") or None
+
+# Mətn qatı (text layer) bu həddən zəifdirsə səhifə OCR edilir
+TEXT_LAYER_MIN_CHARS = int(os.getenv("TEXT_LAYER_MIN_CHARS", 40))
+TEXT_LAYER_MIN_QUALITY = float(os.getenv("TEXT_LAYER_MIN_QUALITY", 0.85))
+# Boş qalarsa DPI seçilmiş presetdən götürülür
+OCR_DPI = int(os.getenv("OCR_DPI")) if os.getenv("OCR_DPI") else None
+
+# Keş tənzimləmələri
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(BASE_DIR, ".cache"))
+TEXT_CACHE_MAX_BYTES = int(os.getenv("TEXT_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+
+# PDF limitləri (rasterləşdirmədən əvvəl yoxlanılır)
+MAX_PDF_BYTES = int(os.getenv("MAX_PDF_BYTES", 10 * 1024 * 1024))
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", 20))
+# Eyni anda render olunub OCR edilən səhifə sayı
+# Pəncərə işçi sayından böyük olanda bir tesseract prosesi bir neçə səhifəni emal edir
+OCR_PAGE_WINDOW = int(os.getenv("OCR_PAGE_WINDOW", 2 * OCR_WORKERS))
+
+# OCR presetləri: render DPI, Tesseract səhifə seqmentasiya rejimi (psm)
+# və şəkil hazırlığı addımları
+OCR_PRESETS = {
+    "fast": {
+        "dpi": 150,
+        "psm": 6,
+        "grayscale": True,
+        "binarize": True,
+        "deskew": False,
+        "crop": True
+    },
+    "balanced": {
+        "dpi": 200,
+        "psm": 3,
+        "grayscale": True,
+        "binarize": True,
+        "deskew": False,
+        "crop": True
+    },
+    "accurate": {
+        "dpi": 300,
+        "psm": 3,
+        "grayscale": True,
+        "binarize": True,
+        "deskew": True,
+        "crop": True
+    },
+    "raw": {
+        "dpi": 200,
+        "psm": 3,
+        "grayscale": False,
+        "binarize": False,
+        "deskew": False,
+        "crop": False
+    }
+}
+OCR_PRESET = os.getenv("OCR_PRESET", "balanced")
+
+# Groq API: eyni anda göndərilən sorğuların maksimum sayı
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", 8))
+
+# LLM təhlil nəticələrinin keşi
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", 7 * 24 * 3600))
+ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", 20 * 1024 * 1024))
+
+# Email lokal tapılmadıqda əlaqə məlumatları və təhlil bir LLM sorğusunda alınır
+COMBINED_ANALYSIS = os.getenv("COMBINED_ANALYSIS", "true").lower() in ("1", "true", "yes")
+
+# Prompta daxil edilən CV mətni üçün token büdcəsi (lokal təxmin)
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", 3000))
+
+# Groq limitləri (hesabın planına uyğun dəyişin)
+GROQ_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", 30))
+GROQ_TOKENS_PER_MINUTE = float(os.getenv("GROQ_TOKENS_PER_MINUTE", 60000))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", 4))
+
+# Lokal ilkin seçim: bal (0-1) bu həddən aşağıdırsa LLM-siz rədd, yuxarıdırsa
+# LLM-siz qəbul edilir. Boş qalarsa həmin avtomatik qərar söndürülür.
+PRESCREEN_REJECT_BELOW = float(os.getenv("PRESCREEN_REJECT_BELOW")) if os.getenv("PRESCREEN_REJECT_BELOW") else None
+PRESCREEN_SHORTLIST_ABOVE = float(os.getenv("PRESCREEN_SHORTLIST_ABOVE")) if os.getenv("PRESCREEN_SHORTLIST_ABOVE") else None
+
+# Model kaskadı: əvvəlcə kiçik model qiymətləndirir, bal qeyri-müəyyənlik
+# zolağına düşərsə və ya cavab yoxlamadan keçməzsə DEFAULT_MODEL çağırılır.
+# Kiçik modelin qərarları keyfiyyət baxımından yoxlanılana qədər söndürülüb
+ANALYSIS_CASCADE = os.getenv("ANALYSIS_CASCADE", "false").lower() in ("1", "true", "yes")
+TRIAGE_MODEL = os.getenv("TRIAGE_MODEL", "llama-3.1-8b-instant")
+CASCADE_BAND_LOW = float(os.getenv("CASCADE_BAND_LOW", "40"))
+CASCADE_BAND_HIGH = float(os.getenv("CASCADE_BAND_HIGH", "80"))
+
+# Şəbəkə timeout-ları (saniyə): qoşulma və cavab oxuma ayrıca
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", 5))
+GROQ_READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", 60))
+ZOOM_CONNECT_TIMEOUT = float(os.getenv("ZOOM_CONNECT_TIMEOUT", 5))
+ZOOM_READ_TIMEOUT = float(os.getenv("ZOOM_READ_TIMEOUT", 15))
+
+# Hedging: sorğu bu müddətdə (təxminən p95) bitməzsə dublikatı göndərilir.
+# Yalnız idempotent sorğulara (təhlil, token alınması) tətbiq olunur; boş = söndürülüb
+GROQ_HEDGE_DELAY = float(os.getenv("GROQ_HEDGE_DELAY")) if os.getenv("GROQ_HEDGE_DELAY") else None
+ZOOM_TOKEN_HEDGE_DELAY = float(os.getenv("ZOOM_TOKEN_HEDGE_DELAY")) if os.getenv("ZOOM_TOKEN_HEDGE_DELAY") else None
+
+# SMTP: security = "starttls", "ssl" və ya "none" (lokal test serveri üçün)
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+SMTP_SECURITY = os.getenv("SMTP_SECURITY", "starttls").lower()
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 15))
+# Bu müddətdən çox boş qalan bağlantı yenidən açılır; daha qısa fasilələrdən sonra NOOP ilə yoxlanılır
+SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", 240))
+SMTP_KEEPALIVE_INTERVAL = float(os.getenv("SMTP_KEEPALIVE_INTERVAL", 30))
+
+# Email outbox: növbə SQLite bazasında saxlanılır, fon işçisi backoff ilə yenidən cəhd edir
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(BASE_DIR, "data"))
+OUTBOX_DB = os.path.join(DATA_DIR, "outbox.sqlite3")
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 6))
+OUTBOX_BASE_DELAY = float(os.getenv("OUTBOX_BASE_DELAY", 5))
+OUTBOX_MAX_DELAY = float(os.getenv("OUTBOX_MAX_DELAY", 600))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 5))
+# Göndərilməyə götürülmüş mesaj bu müddətdən sonra da bitməyibsə işçi dayanmış sayılır və
+# mesaj yenidən götürülür; bir paketin (50 mesaj) göndərilmə vaxtından uzun olmalıdır
+OUTBOX_CLAIM_TIMEOUT = float(os.getenv("OUTBOX_CLAIM_TIMEOUT", 900))
+
+# Zoom OAuth tokeni expires_in bitməzdən bu qədər saniyə əvvəl yenilənir
+ZOOM_TOKEN_REFRESH_MARGIN = float(os.getenv("ZOOM_TOKEN_REFRESH_MARGIN", 60))
+ZOOM_POOL_SIZE = int(os.getenv("ZOOM_POOL_SIZE", 10))
+
+# Müsahibə cədvəli (TIMEZONE üzrə): iş saatları pəncərələri, iş günləri (0 = bazar ertəsi),
+# slot müddəti, müsahibələr arası bufer və bayram günləri (YYYY-MM-DD, vergüllə)
+INTERVIEW_WINDOWS = os.getenv("INTERVIEW_WINDOWS", "10:00-12:30,14:00-17:30")
+INTERVIEW_WORKDAYS = [int(d) for d in os.getenv("INTERVIEW_WORKDAYS", "0,1,2,3,4").split(",") if d.strip()]
+INTERVIEW_SLOT_MINUTES = int(os.getenv("INTERVIEW_SLOT_MINUTES", 60))
+INTERVIEW_BUFFER_MINUTES = int(os.getenv("INTERVIEW_BUFFER_MINUTES", 15))
+INTERVIEW_HOLIDAYS = [
+    datetime.strptime(d.strip(), "%Y-%m-%d").date()
+    for d in os.getenv("INTERVIEW_HOLIDAYS", "").split(",") if d.strip()
+]
+INTERVIEW_HORIZON_DAYS = int(os.getenv("INTERVIEW_HORIZON_DAYS", 30))
+# Ən erkən müsahibə indidən bu qədər saat sonra ola bilər
+INTERVIEW_MIN_NOTICE_HOURS = float(os.getenv("INTERVIEW_MIN_NOTICE_HOURS", 12))
+INTERVIEW_DB = os.path.join(DATA_DIR, "interviews.sqlite3")
+
+# Toplu Zoom görüş yaradılması: paralel sorğu sayı, hesab üzrə saniyəlik limit və 429 təkrarları
+ZOOM_BULK_CONCURRENCY = int(os.getenv("ZOOM_BULK_CONCURRENCY", 8))
+ZOOM_REQUESTS_PER_SECOND = float(os.getenv("ZOOM_REQUESTS_PER_SECOND", 5))
+ZOOM_MAX_RETRIES = int(os.getenv("ZOOM_MAX_RETRIES", 3))
+
+# Bu qədər saniyə resurs istəməyən sessiya (bağlanmış tab) paylaşılan klientin sahibi sayılmır
+RESOURCE_HOLDER_TTL = float(os.getenv("RESOURCE_HOLDER_TTL", 3600))
@@ -0,0 +1,240 @@
+"""CV qovluğunun Streamlit-siz toplu təhlili.
+
+İstifadə:
+    python -m src.core.batch_screening <qovluq> --role backend_engineer \\
+        --output results.jsonl --csv results.csv --concurrency 4
+
+Nəticələr JSONL faylına hər CV bitən kimi əlavə olunur. Skript yarımçıq
+qalarsa yenidən işə salındıqda artıq uğurla təhlil olunmuş fayllar
+(məzmunun SHA-256-sı və rol üzrə) ötürülür.
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+from src.config.constants import ROLE_REQUIREMENTS
+from src.core.groq_agent import GroqAgent
+from src.core.request_scheduler import PRIORITY_BATCH
+from src.utils.document_ingestion import DocumentIngestor
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK = 1024 * 1024
+
+CSV_FIELDS = ["file", "sha256", "role", "status", "email", "phone", "uyğunluq_faizi", "qərar", "tier", "error", "elapsed_s"]
+
+
+def file_sha256(path: str) -> str:
+    """Faylı bütövlükdə yaddaşa oxumadan hissə-hissə hash edir"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class _NamedFile:
+    """Diskdəki faylı DocumentIngestor-un gözlədiyi yüklənmiş fayl kimi təqdim edir"""
+
+    def __init__(self, path: str, data: bytes):
+        self.name = os.path.basename(path)
+        self._data = data
+
+    def getvalue(self) -> bytes:
+        return self._data
+
+
+class BatchScreener:
+    def __init__(self, groq_agent: GroqAgent, role: str, output_path: str,
+                 concurrency: int = 4, ingestor: Optional[DocumentIngestor] = None):
+        if role not in ROLE_REQUIREMENTS:
+            raise ValueError(f"Naməlum vəzifə: {role}")
+        self.groq_agent = groq_agent
+        self.role = role
+        self.output_path = output_path
+        self.concurrency = max(1, concurrency)
+        self.ingestor = ingestor or DocumentIngestor()
+        self._write_lock = asyncio.Lock()
+
+    def load_completed(self) -> set:
+        """Əvvəlki işdən uğurla bitmiş (sha256, rol) cütlərini oxuyur"""
+        completed = set()
+        if not os.path.exists(self.output_path):
+            return completed
+        with open(self.output_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Kəsilmiş sonuncu sətir
+                    continue
+                if record.get("status") == "ok":
+                    completed.add((record.get("sha256"), record.get("role")))
+        return completed
+
+    def collect_files(self, directory: str) -> List[str]:
+        files = []
+        for name in sorted(os.listdir(directory)):
+            extension = os.path.splitext(name)[1].lower().lstrip(".")
+            if extension in DocumentIngestor.SUPPORTED_TYPES:
+                files.append(os.path.join(directory, name))
+        return files
+
+    async def _append(self, record: Dict):
+        async with self._write_lock:
+            with open(self.output_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    async def screen_file(self, path: str, sha256: str) -> Dict:
+        start = time.perf_counter()
+        record = {"file": os.path.basename(path), "sha256": sha256, "role": self.role}
+        try:
+            # Fayl yalnız işçi onu götürəndə oxunur, yaddaşda eyni anda ən çox concurrency fayl olur
+            data = await asyncio.to_thread(_read_bytes, path)
+            resume_text = await asyncio.to_thread(self.ingestor.extract_text, _NamedFile(path, data))
+            if not resume_text:
+                raise ValueError("Mətn çıxarıla bilmədi")
+
+            contacts, analysis = await self.groq_agent.extract_contacts_with_analysis(resume_text, self.role)
+            if analysis is None:
+                analysis = await self.groq_agent.analyze_resume(resume_text, self.role)
+            if analysis.get("xəta"):
+                raise RuntimeError(analysis["xəta"])
+
+            record.update({
+                "status": "ok",
+                "email": contacts["email"],
+                "phone": contacts["phones"][0] if contacts["phones"] else None,
+                "contacts": contacts,
+                "uyğunluq_faizi": analysis.get("uyğunluq_faizi"),
+                "qərar": analysis.get("qərar"),
+                "tier": analysis.get("_meta", {}).get("tier"),
+                "analysis": analysis
+            })
+        except Exception as e:
+            logger.error(f"Batch screening error for {path}: {str(e)}")
+            record.update({"status": "error", "error": str(e)})
+
+        record["elapsed_s"] = round(time.perf_counter() - start, 3)
+        await self._append(record)
+        return record
+
+    async def run(self, directory: str) -> Dict:
+        """Qovluqdakı bütün CV-ləri təhlil edir və xülasə qaytarır.
+
+        Fayllar hash olunaraq məhdud növbəyə yazılır və concurrency sayda
+        işçi tərəfindən götürülür, ona görə böyük qovluqda da bütün fayllar
+        və korutinlər eyni anda yaddaşda olmur.
+        """
+        completed = self.load_completed()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        records = []
+        skipped = 0
+
+        async def producer():
+            nonlocal skipped
+            queued = set()
+            for path in self.collect_files(directory):
+                try:
+                    sha256 = await asyncio.to_thread(file_sha256, path)
+                except OSError as e:
+                    logger.error(f"Batch screening read error for {path}: {str(e)}")
+                    continue
+                if (sha256, self.role) in completed or sha256 in queued:
+                    skipped += 1
+                    continue
+                queued.add(sha256)
+                await queue.put((path, sha256))
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    records.append(await self.screen_file(*item))
+                finally:
+                    queue.task_done()
+
+        start = time.perf_counter()
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            await producer()
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        elapsed = time.perf_counter() - start
+
+        succeeded = sum(1 for r in records if r["status"] == "ok")
+        return {
+            "processed": len(records),
+            "succeeded": succeeded,
+            "failed": len(records) - succeeded,
+            "skipped": skipped,
+            "elapsed_s": round(elapsed, 2),
+            "cv_per_minute": round(len(records) / elapsed * 60, 2) if elapsed > 0 and records else 0.0
+        }
+
+    def export_csv(self, csv_path: str):
+        """JSONL nəticələrini (hər fayl üçün sonuncu qeyd) CSV-yə yazır"""
+        latest = {}
+        with open(self.output_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                latest[(record.get("sha256"), record.get("role"))] = record
+
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for record in latest.values():
+                writer.writerow(record)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CV-lərin toplu təhlili")
+    parser.add_argument("directory", help="CV fayllarının olduğu qovluq")
+    parser.add_argument("--role", required=True, choices=list(ROLE_REQUIREMENTS.keys()))
+    parser.add_argument("--output", default="screening_results.jsonl")
+    parser.add_argument("--csv", help="Əlavə olaraq CSV faylına yaz")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    screener = BatchScreener(GroqAgent(priority=PRIORITY_BATCH), args.role, args.output, concurrency=args.concurrency)
+    summary = asyncio.run(screener.run(args.directory))
+    if args.csv:
+        screener.export_csv(args.csv)
+
+    print(
+        f"Emal olundu: {summary['processed']} (uğurlu {summary['succeeded']}, "
+        f"xəta {summary['failed']}), ötürüldü: {summary['skipped']}"
+    )
+    print(f"Müddət: {summary['elapsed_s']} s, sürət: {summary['cv_per_minute']} CV/dəqiqə")
+    print(f"Groq növbəsi: {screener.groq_agent.scheduler.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
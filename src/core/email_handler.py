@@ -1,21 +1,29 @@
+import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 import logging
 from datetime import datetime
-from dotenv import load_dotenv
 import streamlit as st
-
-# .env faylını yüklə
-load_dotenv()
+from typing import Dict, List, Optional, Tuple
+from src.config.settings import (
+    SMTP_HOST,
+    SMTP_IDLE_TIMEOUT,
+    SMTP_KEEPALIVE_INTERVAL,
+    SMTP_PORT,
+    SMTP_SECURITY,
+    SMTP_TIMEOUT,
+)
+from src.utils.smtp_session import get_smtp_session
+from src.core.email_outbox import get_outbox, make_idempotency_key, make_sender_key
 
 logger = logging.getLogger(__name__)
 
 class EmailHandler:
     def __init__(self):
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
+        self.smtp_server = SMTP_HOST
+        self.smtp_port = SMTP_PORT
         
         # Email konfiqurasiyasını yoxla
         self.sender_email = os.getenv("EMAIL_ADDRESS") or st.session_state.get('email_address')
@@ -26,51 +34,126 @@ class EmailHandler:
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-    async def send_email(self, to_email, subject, body):
-        """Email göndərmə"""
+        # Bağlantı proses səviyyəsində saxlanılır və handler-lər arasında paylaşılır
+        self.session = get_smtp_session(
+            self.smtp_server,
+            self.smtp_port,
+            self.sender_email,
+            self.sender_password,
+            security=SMTP_SECURITY,
+            timeout=SMTP_TIMEOUT,
+            idle_timeout=SMTP_IDLE_TIMEOUT,
+            keepalive_interval=SMTP_KEEPALIVE_INTERVAL
+        )
+        self.outbox = get_outbox()
+        # Mesajlar yalnız onları növbəyə yazan etimadnamə ilə göndərilir
+        self.sender_key = make_sender_key(self.smtp_server, self.smtp_port, self.sender_email, self.sender_password)
+        self.outbox.register_sender(self.sender_email, self.sender_key, self._deliver_batch)
+
+    def _build_message(self, to_email, subject, body) -> MIMEMultipart:
         if not to_email or not subject or not body:
             raise ValueError("Email məlumatları tam deyil")
 
-        try:
-            # Email mesajını hazırla
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.sender_email
-            msg['To'] = to_email
-            msg['Subject'] = subject
-
-            # HTML mətnini əlavə et
-            html_part = MIMEText(body, 'html', 'utf-8')
-            msg.attach(html_part)
-
-            # SMTP server-ə qoşul
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.ehlo()
-                server.starttls()
-                server.ehlo()
-                
-                # Login və göndərmə
-                try:
-                    server.login(self.sender_email, self.sender_password)
-                    server.send_message(msg)
-                    logger.info(f"Email successfully sent to {to_email}")
-                    return True
-                except smtplib.SMTPAuthenticationError:
-                    error_msg = "Email autentifikasiya xətası. Gmail App Password düzgün deyil."
-                    logger.error(error_msg)
-                    raise ValueError(error_msg)
-                except Exception as e:
-                    logger.error(f"SMTP error: {str(e)}")
-                    raise
+        msg = MIMEMultipart('alternative')
+        msg['From'] = self.sender_email
+        msg['To'] = to_email
+        msg['Subject'] = subject
+
+        # HTML mətnini əlavə et
+        html_part = MIMEText(body, 'html', 'utf-8')
+        msg.attach(html_part)
+        return msg
 
+    async def send_email(self, to_email, subject, body):
+        """Email göndərmə"""
+        msg = self._build_message(to_email, subject, body)
+
+        try:
+            # smtplib bloklayandır, event loop-u tutmasın deyə ayrıca thread-də işləyir
+            await asyncio.to_thread(self.session.send, msg)
+            logger.info(f"Email successfully sent to {to_email}")
+            return True
+        except smtplib.SMTPAuthenticationError:
+            error_msg = "Email autentifikasiya xətası. Gmail App Password düzgün deyil."
+            logger.error(error_msg)
+            raise ValueError(error_msg)
         except Exception as e:
             logger.error(f"Email göndərilməsi xətası: {str(e)}")
             raise
 
-    async def send_selection_email(self, to_email, role):
-        """Seçim emaili göndərmə"""
+    async def send_many(self, messages: List[Tuple[str, str, str]]) -> List[Dict]:
+        """(to_email, subject, body) siyahısını bir autentifikasiya olunmuş bağlantı üzərindən göndərir.
+
+        Bir mesajın uğursuzluğu qalanlarını dayandırmır; hər mesaj üçün
+        {"to", "ok", "error"} qaytarılır.
+        """
+        results = []
+        built = []
+        for to_email, subject, body in messages:
+            try:
+                built.append(self._build_message(to_email, subject, body))
+                results.append({"to": to_email, "ok": None, "error": None})
+            except ValueError as e:
+                results.append({"to": to_email, "ok": False, "error": str(e)})
+
+        try:
+            errors = await asyncio.to_thread(self.session.send_many, built)
+        except smtplib.SMTPAuthenticationError:
+            error_msg = "Email autentifikasiya xətası. Gmail App Password düzgün deyil."
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        errors = iter(errors)
+        for result in results:
+            if result["ok"] is None:
+                error = next(errors)
+                result["ok"] = error is None
+                result["error"] = str(error) if error else None
+        logger.info(f"Bulk email: {sum(r['ok'] for r in results)}/{len(results)} sent")
+        return results
+
+    def _deliver_batch(self, messages: List[Tuple[str, str, str]]) -> List[Optional[str]]:
+        """Outbox işçisi üçün: mesajları bir bağlantı ilə göndərir, hər biri üçün xəta mətni və ya None"""
+        errors = self.session.send_many([self._build_message(*message) for message in messages])
+        return [str(error) if error else None for error in errors]
+
+    def enqueue_email(self, to_email, role, email_type, subject, body) -> Dict:
+        """Emaili outbox-a yazır və dərhal qaytarır; göndərişi fon işçisi edir.
+
+        Açar namizəd, vəzifə və email növündən yaranır, ona görə rerun və ya
+        təkrar klik eyni emaili ikinci dəfə göndərmir.
+        """
+        self._build_message(to_email, subject, body)
+        key = make_idempotency_key(to_email, role, email_type)
+        record = self.outbox.enqueue(self.sender_email, self.sender_key, to_email, email_type, subject, body, key)
+        logger.info(f"Email {email_type} for {to_email} queued (status={record['status']})")
+        return record
+
+    def enqueue_selection_email(self, to_email, role) -> Dict:
         if not to_email or not role:
             raise ValueError("Email və ya rol məlumatı çatışmır")
+        return self.enqueue_email(to_email, role, "selection", *self.selection_email(role))
+
+    def enqueue_rejection_email(self, to_email, role, feedback, suggestions) -> Dict:
+        if not all([to_email, role, feedback]):
+            raise ValueError("Email məlumatları tam deyil")
+        return self.enqueue_email(to_email, role, "rejection", *self.rejection_email(role, feedback, suggestions))
+
+    def enqueue_interview_confirmation(self, to_email, role, meeting_details, booking_id) -> Dict:
+        """Açar rezervasiyaya bağlıdır: yeni vaxt (yenidən rezervasiya) yeni təsdiq emailidir"""
+        if not all([to_email, role, meeting_details, booking_id]):
+            raise ValueError("Müsahibə məlumatları tam deyil")
+        return self.enqueue_email(
+            to_email, role, f"interview:{booking_id}", *self.interview_confirmation_email(role, meeting_details)
+        )
+
+    def delivery_status(self, to_email) -> List[Dict]:
+        """Namizədə göndərilən emaillərin outbox vəziyyəti"""
+        return self.outbox.statuses_for(to_email) if to_email else []
 
+    @staticmethod
+    def selection_email(role) -> Tuple[str, str]:
+        """Seçim emailinin mövzusu və HTML mətni (send_many üçün də istifadə olunur)"""
         subject = f"Təbriklər! {role} vəzifəsi üçün seçildiniz"
         body = f"""
         <html>
@@ -85,14 +168,11 @@ class EmailHandler:
         </body>
         </html>
         """
-        
-        return await self.send_email(to_email, subject, body)
-
-    async def send_rejection_email(self, to_email, role, feedback, suggestions):
-        """Rədd emaili göndərmə"""
-        if not all([to_email, role, feedback]):
-            raise ValueError("Email məlumatları tam deyil")
+        return subject, body
 
+    @staticmethod
+    def rejection_email(role, feedback, suggestions) -> Tuple[str, str]:
+        """Rədd emailinin mövzusu və HTML mətni"""
         subject = f"{role} vəzifəsi üçün müraciətiniz"
         body = f"""
         <html>
@@ -112,14 +192,11 @@ class EmailHandler:
         </body>
         </html>
         """
-        
-        return await self.send_email(to_email, subject, body)
-
-    async def send_interview_confirmation(self, to_email, role, meeting_details):
-        """Müsahibə təsdiqi emaili"""
-        if not all([to_email, role, meeting_details]):
-            raise ValueError("Müsahibə məlumatları tam deyil")
+        return subject, body
 
+    @staticmethod
+    def interview_confirmation_email(role, meeting_details) -> Tuple[str, str]:
+        """Müsahibə təsdiqi emailinin mövzusu və HTML mətni"""
         subject = f"Müsahibə Təsdiqi - {role} vəzifəsi"
         body = f"""
         <html>
@@ -137,5 +214,22 @@ class EmailHandler:
         </body>
         </html>
         """
-        
-        return await self.send_email(to_email, subject, body)
\ No newline at end of file
+        return subject, body
+
+    async def send_selection_email(self, to_email, role):
+        """Seçim emaili göndərmə"""
+        if not to_email or not role:
+            raise ValueError("Email və ya rol məlumatı çatışmır")
+        return await self.send_email(to_email, *self.selection_email(role))
+
+    async def send_rejection_email(self, to_email, role, feedback, suggestions):
+        """Rədd emaili göndərmə"""
+        if not all([to_email, role, feedback]):
+            raise ValueError("Email məlumatları tam deyil")
+        return await self.send_email(to_email, *self.rejection_email(role, feedback, suggestions))
+
+    async def send_interview_confirmation(self, to_email, role, meeting_details):
+        """Müsahibə təsdiqi emaili"""
+        if not all([to_email, role, meeting_details]):
+            raise ValueError("Müsahibə məlumatları tam deyil")
+        return await self.send_email(to_email, *self.interview_confirmation_email(role, meeting_details))
@@ -0,0 +1,284 @@
+import atexit
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.config.settings import (
+    OUTBOX_BASE_DELAY,
+    OUTBOX_CLAIM_TIMEOUT,
+    OUTBOX_DB,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_DELAY,
+    OUTBOX_POLL_INTERVAL,
+)
+
+logger = logging.getLogger(__name__)
+
+# (to_email, subject, body) siyahısını göndərib hər mesaj üçün xəta mətni və ya None qaytarır
+DeliverFn = Callable[[List[Tuple[str, str, str]]], List[Optional[str]]]
+
+STATUS_PENDING = "pending"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    sender TEXT NOT NULL,
+    sender_key TEXT,
+    to_email TEXT NOT NULL,
+    email_type TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_at REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS outbox_to ON outbox (to_email);
+"""
+
+# Əvvəlki versiyanın bazasına əlavə olunan sütunlar
+_MIGRATIONS = {
+    "sender_key": "ALTER TABLE outbox ADD COLUMN sender_key TEXT",
+    "claimed_at": "ALTER TABLE outbox ADD COLUMN claimed_at REAL",
+}
+
+
+def make_sender_key(*credentials) -> str:
+    """Göndərən hesabın etimadnaməsindən (server, port, ünvan, parol) hash; parol bazaya yazılmır"""
+    return hashlib.sha256(repr(credentials).encode("utf-8")).hexdigest()
+
+
+def make_idempotency_key(to_email: str, role: str, email_type: str) -> str:
+    """Eyni namizəd, vəzifə və email növü üçün həmişə eyni açar"""
+    raw = f"{to_email.strip().lower()}|{role}|{email_type}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class EmailOutbox:
+    """SQLite üzərində davamlı email növbəsi və fon göndərmə işçisi.
+
+    UI emaili növbəyə yazıb dərhal davam edir; fon thread-i vaxtı çatmış
+    mesajları göndərən hesabın bağlantısı ilə toplu göndərir, uğursuz
+    olanları eksponensial backoff ilə yenidən cəhd edir. Eyni idempotency
+    açarı ilə ikinci dəfə əlavə edilən email yenidən göndərilmir.
+
+    SMTP parolları bazada saxlanılmır: hər mesaj onu növbəyə yazan
+    hesabın etimadnamə hash-i (sender_key) ilə saxlanılır və yalnız eyni
+    etimadnamə ilə register_sender edilmiş funksiya ilə göndərilir. Səhv
+    parol daxil edən sessiya başqalarının mesajlarını götürə bilməz.
+    Proses yenidən başladıqda həmin hesab üçün EmailHandler yaradılana
+    qədər mesajlar növbədə gözləyir.
+
+    Götürülmüş mesaj claimed_at vaxtı ilə "sending" olur. Bu icarə
+    claim_timeout saniyədən köhnədirsə (işçi göndərmə zamanı dayanıb)
+    mesaj yenidən götürülür; davam edən göndərişlərə toxunulmur.
+    """
+
+    def __init__(self, db_path: str = OUTBOX_DB, max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+                 base_delay: float = OUTBOX_BASE_DELAY, max_delay: float = OUTBOX_MAX_DELAY,
+                 poll_interval: float = OUTBOX_POLL_INTERVAL, claim_timeout: float = OUTBOX_CLAIM_TIMEOUT):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.claim_timeout = claim_timeout
+
+        # (göndərən, sender_key) -> göndərmə funksiyası
+        self._senders: Dict[Tuple[str, str], DeliverFn] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(outbox)")}
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def register_sender(self, sender: str, sender_key: str, deliver: DeliverFn):
+        """Yalnız həmin etimadnamə ilə növbəyə yazılmış mesajları göndərəcək funksiyanı qeyd edir"""
+        with self._lock:
+            self._senders[(sender, sender_key)] = deliver
+        self.start()
+        self._wakeup.set()
+
+    def enqueue(self, sender: str, sender_key: str, to_email: str, email_type: str, subject: str, body: str,
+                idempotency_key: str) -> Dict:
+        """Emaili növbəyə əlavə edir; açar artıq varsa mövcud qeydi dəyişmədən qaytarır"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, sender, sender_key, to_email, email_type, subject,"
+                " body, status, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (idempotency_key, sender, sender_key, to_email, email_type, subject, body, STATUS_PENDING, now, now)
+            )
+        self._wakeup.set()
+        return self.status(idempotency_key)
+
+    def status(self, idempotency_key: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM outbox WHERE idempotency_key = ?", (idempotency_key,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def statuses_for(self, to_email: str) -> List[Dict]:
+        """Namizədə göndərilən bütün emaillərin vəziyyəti (yenidən köhnəyə)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, email_type, subject, status, attempts, last_error, created_at, sent_at"
+                " FROM outbox WHERE to_email = ? ORDER BY id DESC",
+                (to_email,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _claim_due(self) -> List[Dict]:
+        with self._lock:
+            keys = [key for _, key in self._senders]
+            senders = sorted({sender for sender, _ in self._senders})
+        if not keys:
+            return []
+
+        now = time.time()
+        key_placeholders = ",".join("?" * len(keys))
+        sender_placeholders = ",".join("?" * len(senders))
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # sender_key-siz köhnə qeydlər həmin ünvanın istənilən qeydiyyatı ilə göndərilir
+            rows = conn.execute(
+                "SELECT * FROM outbox WHERE ((status = ? AND next_attempt_at <= ?) OR (status = ? AND COALESCE(claimed_at, 0) <= ?))"
+                f" AND (sender_key IN ({key_placeholders})"
+                f" OR (sender_key IS NULL AND sender IN ({sender_placeholders})))"
+                " ORDER BY id LIMIT 50",
+                (STATUS_PENDING, now, STATUS_SENDING, now - self.claim_timeout, *keys, *senders)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE outbox SET status = ?, claimed_at = ? WHERE id = ?",
+                [(STATUS_SENDING, now, row["id"]) for row in rows]
+            )
+        for row in rows:
+            if row["status"] == STATUS_SENDING:
+                logger.warning(f"Outbox message {row['id']} claim expired, retrying")
+        return [dict(row, status=STATUS_SENDING, claimed_at=now) for row in rows]
+
+    def _sender_for(self, row: Dict) -> Tuple[str, str]:
+        with self._lock:
+            if row["sender_key"] is not None:
+                return row["sender"], row["sender_key"]
+            return next(key for key in self._senders if key[0] == row["sender"])
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _record(self, row: Dict, error: Optional[str]):
+        now = time.time()
+        attempts = row["attempts"] + 1
+        # Uğursuzluq yalnız icarə hələ bizdədirsə yazılır (vaxtı keçib başqa işçiyə
+        # keçibsə yox); göndərilmiş mesaj isə hər halda göndərilmiş sayılır
+        claim = (row["id"], row["claimed_at"])
+        with self._connect() as conn:
+            if error is None:
+                conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = ?, sent_at = ?, last_error = NULL, claimed_at = NULL"
+                    " WHERE id = ?",
+                    (STATUS_SENT, attempts, now, row["id"])
+                )
+            elif attempts >= self.max_attempts:
+                logger.error(f"Outbox message {row['id']} to {row['to_email']} failed permanently: {error}")
+                conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, claimed_at = NULL"
+                    " WHERE id = ? AND claimed_at = ?",
+                    (STATUS_FAILED, attempts, error, *claim)
+                )
+            else:
+                conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, claimed_at = NULL"
+                    " WHERE id = ? AND claimed_at = ?",
+                    (STATUS_PENDING, attempts, error, now + self._backoff(attempts), *claim)
+                )
+
+    def process_due(self) -> int:
+        """Vaxtı çatmış mesajları göndərir; göndərilməyə cəhd edilən mesaj sayını qaytarır"""
+        rows = self._claim_due()
+        by_sender: Dict[Tuple[str, str], List[Dict]] = {}
+        for row in rows:
+            by_sender.setdefault(self._sender_for(row), []).append(row)
+
+        for (sender, sender_key), sender_rows in by_sender.items():
+            with self._lock:
+                deliver = self._senders[(sender, sender_key)]
+            try:
+                errors = deliver([(row["to_email"], row["subject"], row["body"]) for row in sender_rows])
+            except Exception as e:
+                # Məsələn autentifikasiya xətası: bütün paket uğursuz sayılır
+                logger.error(f"Outbox delivery error for {sender}: {str(e)}")
+                errors = [str(e)] * len(sender_rows)
+            for row, error in zip(sender_rows, errors):
+                self._record(row, error)
+        return len(rows)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self.process_due()
+            except Exception as e:
+                logger.error(f"Outbox worker error: {str(e)}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox() -> EmailOutbox:
+    """Prosesdə bir outbox və bir fon işçisi olur"""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = EmailOutbox()
+            atexit.register(_outbox.stop)
+        return _outbox
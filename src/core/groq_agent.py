@@ -1,87 +1,546 @@
 import os
-from groq import Groq
+import asyncio
+import httpx
+from groq import AsyncGroq
 import json
-from typing import Dict, Optional
-from dotenv import load_dotenv
+import hashlib
+import re
+import time
+from typing import AsyncIterator, Dict, Optional, Tuple
 import logging
+from src.config.settings import (
+    ANALYSIS_CACHE_MAX_BYTES,
+    ANALYSIS_CACHE_TTL,
+    ANALYSIS_CASCADE,
+    CACHE_DIR,
+    CASCADE_BAND_HIGH,
+    CASCADE_BAND_LOW,
+    DEFAULT_MODEL,
+    GROQ_CONNECT_TIMEOUT,
+    GROQ_HEDGE_DELAY,
+    GROQ_MAX_CONCURRENCY,
+    GROQ_READ_TIMEOUT,
+    RESUME_TOKEN_BUDGET,
+    TRIAGE_MODEL,
+)
+from src.utils.cache import DiskCache
+from src.utils.contact_extractor import extract_contacts, is_valid_email
+from src.utils.prompt_compactor import compact_resume, estimate_tokens
+from src.utils.json_repair import StreamingJSONParser, parse_json_checked
+from src.utils.hedging import hedged
+from src.core.request_scheduler import PRIORITY_INTERACTIVE, get_scheduler
+from src.core.prescreening import get_prescreener
+from src.config.constants import ROLE_REQUIREMENTS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class GroqAgent:
-    def __init__(self, api_key: str = None):
-        """Initialize Groq agent with API key"""
-        load_dotenv()
-        self.api_key = api_key or os.getenv("GROQ_API_KEY")
-        if not self.api_key:
-            raise ValueError("GROQ_API_KEY tapılmadı!")
-        
-        self.client = Groq(api_key=self.api_key)
-        self.model = "llama-3.3-70b-versatile"  # Groq-un təklif etdiyi model
+ANALYSIS_SYSTEM_PROMPT = "Sən HR və texniki mütəxəssislərdən ibarət komandanın üzvüsən."
 
-    async def analyze_resume(self, resume_text: str, role: str) -> Dict:
-        """CV-ni təhlil edir və nəticəni qaytarır"""
-        try:
-            prompt = f"""
+ANALYSIS_PROMPT_TEMPLATE = """
             Aşağıdakı CV-ni təhlil et və {role} vəzifəsi üçün uyğunluğunu qiymətləndir.
             
+            Vəzifə tələbləri:
+            {requirements}
+            
+            Lokal açar söz yoxlaması:
+            Uyğun gələn bacarıqlar: {matched_skills}
+            CV-də tapılmayan bacarıqlar: {missing_skills}
+            (Bu yoxlama sadə açar söz axtarışıdır, son qərarı CV-nin özünə əsasən ver.)
+            
             CV Mətni:
             {resume_text}
             
             Aşağıdakı JSON formatında cavab ver:
             {{
-                "təhlil": "CV-nin ətraflı təhlili",
-                "güclü_tərəflər": ["güclü tərəflərin siyahısı"],
-                "zəif_tərəflər": ["inkişaf tələb edən sahələr"],
                 "uyğunluq_faizi": "0-100 arası rəqəm",
                 "qərar": "qəbul" ya "rədd",
-                "məsləhətlər": ["inkişaf üçün məsləhətlər"]
+                "güclü_tərəflər": ["güclü tərəflərin siyahısı"],
+                "zəif_tərəflər": ["inkişaf tələb edən sahələr"],
+                "məsləhətlər": ["inkişaf üçün məsləhətlər"],
+                "təhlil": "CV-nin ətraflı təhlili"{contact_schema}
             }}
+            Yalnız JSON obyekti qaytar, markdown və ya əlavə mətn yazma.
             """
-            
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Sən HR və texniki mütəxəssislərdən ibarət komandanın üzvüsən."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
-                temperature=0.5,
-                max_tokens=2000
+
+# Birləşdirilmiş rejimdə əlaqə məlumatları eyni cavabda qaytarılır
+CONTACT_SCHEMA = """,
+                "əlaqə": {
+                    "email": "namizədin email ünvanı və ya boş string",
+                    "telefon": "telefon nömrəsi və ya boş string",
+                    "linkedin": "LinkedIn linki və ya boş string",
+                    "github": "GitHub linki və ya boş string"
+                }"""
+
+# Prompt və ya vəzifə tələbləri dəyişdikdə versiya da dəyişir və köhnə keş açarları avtomatik etibarsız olur
+PROMPT_VERSION = hashlib.sha256(
+    (ANALYSIS_SYSTEM_PROMPT + ANALYSIS_PROMPT_TEMPLATE + CONTACT_SCHEMA
+     + json.dumps(ROLE_REQUIREMENTS, sort_keys=True)).encode()
+).hexdigest()[:12]
+
+ANALYSIS_REQUIRED_FIELDS = ("təhlil", "uyğunluq_faizi", "qərar")
+ANALYSIS_LIST_FIELDS = ("güclü_tərəflər", "zəif_tərəflər", "məsləhətlər")
+ANALYSIS_DECISIONS = ("qəbul", "rədd")
+
+analysis_cache = DiskCache(
+    os.path.join(CACHE_DIR, "analysis"),
+    ANALYSIS_CACHE_MAX_BYTES,
+    suffix=".json",
+    ttl=ANALYSIS_CACHE_TTL
+)
+
+class GroqAgent:
+    def __init__(self, api_key: str = None, max_concurrency: int = GROQ_MAX_CONCURRENCY,
+                 token_budget: int = RESUME_TOKEN_BUDGET, priority: int = PRIORITY_INTERACTIVE):
+        """Initialize Groq agent with API key"""
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not self.api_key:
+            raise ValueError("GROQ_API_KEY tapılmadı!")
+        
+        self.max_concurrency = max(1, max_concurrency)
+        self.token_budget = token_budget
+        self.priority = priority
+        self.scheduler = get_scheduler()
+        self.model = DEFAULT_MODEL
+        self.triage_model = TRIAGE_MODEL
+        self.cascade = ANALYSIS_CASCADE
+        self.uncertainty_band = (CASCADE_BAND_LOW, CASCADE_BAND_HIGH)
+        self.timeout = httpx.Timeout(GROQ_READ_TIMEOUT, connect=GROQ_CONNECT_TIMEOUT)
+        self.hedge_delay = GROQ_HEDGE_DELAY
+
+        # Async klient və semafor event loop-a bağlıdır, ona görə hər loop
+        # üçün bir dəfə yaradılır və həmin loop daxilində təkrar istifadə olunur
+        self._client = None
+        self._client_loop = None
+        self._semaphore = None
+
+    def _get_client(self) -> AsyncGroq:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # Hedging aktivdirsə dublikat sorğular üçün də bağlantı yeri saxlanılır
+            connections = self.max_concurrency * (2 if self.hedge_delay is not None else 1)
+            http_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=connections,
+                    max_keepalive_connections=connections
+                )
+            )
+            # Təkrar cəhdləri RequestScheduler idarə edir; timeout hər sorğuya ayrıca ötürülür,
+            # əks halda Groq klienti öz (10 dəqiqəlik) default-unu istifadə edir
+            self._client = AsyncGroq(api_key=self.api_key, http_client=http_client,
+                                     max_retries=0, timeout=self.timeout)
+            self._client_loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _chat(self, **kwargs):
+        """Chat completion sorğusu.
+
+        Sorğu ümumi planlayıcıdan keçir (RPM/TPM limitləri, prioritet,
+        backoff, eyni sorğuların birləşdirilməsi); eyni anda ən çox
+        max_concurrency sorğu göndərilir. Bütün chat sorğuları idempotent
+        olduğundan hedge_delay təyin edildikdə gecikən sorğunun dublikatı
+        göndərilir (RPM limitində yer varsa).
+        """
+        client = self._get_client()
+        semaphore = self._semaphore
+        tokens = sum(estimate_tokens(m["content"]) for m in kwargs["messages"]) + kwargs.get("max_tokens", 0)
+        dedup_key = hashlib.sha256(
+            json.dumps([self.api_key, kwargs], sort_keys=True, ensure_ascii=False).encode()
+        ).hexdigest()
+
+        def allow_hedge() -> bool:
+            return self.scheduler.request_bucket.try_acquire(1) == 0
+
+        async def call():
+            async with semaphore:
+                return await hedged(
+                    lambda: client.chat.completions.create(**kwargs),
+                    self.hedge_delay,
+                    allow_hedge
+                )
+
+        return await self.scheduler.submit(call, priority=self.priority, tokens=tokens, dedup_key=dedup_key)
+
+    async def _chat_stream(self, **kwargs):
+        """Axınlı chat completion; hissələr gəldikcə qaytarılır"""
+        client = self._get_client()
+        tokens = sum(estimate_tokens(m["content"]) for m in kwargs["messages"]) + kwargs.get("max_tokens", 0)
+
+        async with self._semaphore:
+            # Axın paylaşıla bilmədiyi üçün eyni sorğular birləşdirilmir
+            stream = await self.scheduler.submit(
+                lambda: client.chat.completions.create(stream=True, **kwargs),
+                priority=self.priority,
+                tokens=tokens
+            )
+            async for chunk in stream:
+                yield chunk
+
+    async def aclose(self):
+        """HTTP bağlantılarını bağlayır"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._client_loop = None
+
+    def _analysis_cache_key(self, resume_text: str, role: str, temperature: float, max_tokens: int,
+                            include_contacts: bool = False) -> str:
+        # Boşluq fərqləri eyni CV üçün fərqli açar yaratmasın
+        normalized = " ".join(resume_text.split())
+        return DiskCache.make_key(
+            normalized.encode("utf-8"),
+            role=role,
+            model=self.model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            include_contacts=include_contacts,
+            cascade=[self.triage_model, *self.uncertainty_band] if self.cascade else None,
+            prompt_version=PROMPT_VERSION
+        )
+
+    @staticmethod
+    def _is_valid_analysis(result) -> bool:
+        return isinstance(result, dict) and all(field in result for field in ANALYSIS_REQUIRED_FIELDS)
+
+    @staticmethod
+    def _clean_llm_contacts(contacts) -> Dict:
+        """LLM-in qaytardığı əlaqə məlumatlarını yoxlayır"""
+        contacts = contacts if isinstance(contacts, dict) else {}
+        email = str(contacts.get("email") or "").strip().lower()
+        return {
+            "email": email if is_valid_email(email) else None,
+            "telefon": str(contacts.get("telefon") or "").strip() or None,
+            "linkedin": str(contacts.get("linkedin") or "").strip() or None,
+            "github": str(contacts.get("github") or "").strip() or None
+        }
+
+    @staticmethod
+    def invalidate_analysis_cache():
+        """Keşlənmiş bütün təhlil nəticələrini silir"""
+        analysis_cache.clear()
+
+    @staticmethod
+    def _prescreen(resume_text: str, role: str) -> Optional[Dict]:
+        """Tələbləri məlum olan vəzifələr üçün lokal ilkin seçim nəticəsi"""
+        prescreener = get_prescreener()
+        if role not in prescreener.roles:
+            return None
+        prescreen = prescreener.evaluate(resume_text, role)
+        logger.info(
+            f"Prescreen {role}: score={prescreen['score']:.2f}, "
+            f"matched={len(prescreen['matched'])}, missing={len(prescreen['missing'])}"
+        )
+        return prescreen
+
+    def _prescreened_analysis(self, prescreen: Optional[Dict], include_contacts: bool) -> Optional[Dict]:
+        """Bal avtomatik hədləri keçirsə LLM-siz nəticə qaytarır"""
+        if not prescreen or not prescreen["decision"]:
+            return None
+
+        percent = round(prescreen["score"] * 100)
+        result = {
+            "uyğunluq_faizi": str(percent),
+            "qərar": prescreen["decision"],
+            "güclü_tərəflər": prescreen["matched"],
+            "zəif_tərəflər": prescreen["missing"],
+            "məsləhətlər": [f"{skill} üzrə bilik və təcrübəni artırın" for skill in prescreen["missing"]],
+            "təhlil": f"Avtomatik ilkin seçim: CV vəzifə tələblərinə {percent}% uyğundur.",
+            "ilkin_seçim": True,
+            "_meta": {"tier": "prescreen", "latency": {}}
+        }
+        if include_contacts:
+            result["əlaqə"] = self._clean_llm_contacts(None)
+        return result
+
+    def _prepare_analysis(self, resume_text: str, role: str,
+                          include_contacts: bool) -> Tuple[Dict, str, Optional[Dict]]:
+        """Təhlil sorğusunun parametrlərini, keş açarını və ilkin seçim nəticəsini hazırlayır"""
+        temperature = 0.5
+        max_tokens = 2000
+
+        # İlkin seçim sıxılmamış mətn üzərində aparılır ki, atılan bölmələr itməsin
+        prescreen = self._prescreen(resume_text, role)
+
+        resume_text, stats = compact_resume(resume_text, self.token_budget)
+        logger.info(
+            f"Resume compacted: {stats['tokens_before']} -> {stats['tokens_after']} tokens"
+            f" (dropped: {', '.join(stats['dropped_sections']) or '-'})"
+        )
+
+        cache_key = self._analysis_cache_key(resume_text, role, temperature, max_tokens, include_contacts)
+        prompt = ANALYSIS_PROMPT_TEMPLATE.format(
+            role=role,
+            requirements=ROLE_REQUIREMENTS.get(role, "-").strip(),
+            matched_skills=", ".join(prescreen["matched"]) if prescreen and prescreen["matched"] else "-",
+            missing_skills=", ".join(prescreen["missing"]) if prescreen and prescreen["missing"] else "-",
+            resume_text=resume_text,
+            contact_schema=CONTACT_SCHEMA if include_contacts else ""
+        )
+        request = {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": ANALYSIS_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "model": self.model,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        return request, cache_key, prescreen
+
+    def _validate_analysis(self, result: Dict, include_contacts: bool) -> Dict:
+        """Cavabı sxemə görə yoxlayır və normallaşdırır; uyğun deyilsə ValueError"""
+        if not self._is_valid_analysis(result):
+            raise ValueError(f"Cavabda tələb olunan sahələr yoxdur: {list(result.keys())}")
+
+        result["qərar"] = str(result["qərar"]).strip().lower()
+        if result["qərar"] not in ANALYSIS_DECISIONS:
+            raise ValueError(f"Naməlum qərar: {result['qərar']}")
+        for field in ANALYSIS_LIST_FIELDS:
+            if not isinstance(result.get(field), list):
+                result[field] = [result[field]] if result.get(field) else []
+        if include_contacts:
+            result["əlaqə"] = self._clean_llm_contacts(result.get("əlaqə"))
+        return result
+
+    def _finalize_analysis(self, result: Dict, include_contacts: bool, cache_key: str, meta: Dict) -> Dict:
+        """Cavabı yoxlayır, qərar verən pilləni qeyd edir və uğurlu nəticəni keşləyir"""
+        result = self._validate_analysis(result, include_contacts)
+        result["_meta"] = meta
+        logger.info(f"Analysis decided by {meta['tier']}: latency={meta['latency']}, "
+                    f"triage_score={meta.get('triage_score')}")
+
+        # Yalnız düzgün parse olunmuş nəticələr keşlənir: xəta cavabı və kəsilib
+        # bərpa olunmuş (yarımçıq "təhlil") cavab heç vaxt
+        if meta.get("truncated"):
+            logger.warning("Analysis response was truncated, not caching")
+        else:
+            analysis_cache.set(cache_key, json.dumps(result, ensure_ascii=False))
+        return result
+
+    @staticmethod
+    def _is_truncated(truncated: bool, finish_reason: Optional[str]) -> bool:
+        return truncated or finish_reason == "length"
+
+    @staticmethod
+    def _score(result: Dict) -> Optional[float]:
+        match = re.search(r"\d+(?:[.,]\d+)?", str(result.get("uyğunluq_faizi", "")))
+        return float(match.group().replace(",", ".")) if match else None
+
+    async def _triage(self, request: Dict, include_contacts: bool, meta: Dict) -> Optional[Dict]:
+        """Kiçik modellə ilkin qiymətləndirmə; nəticə qəti deyilsə None qaytarır"""
+        if not self.cascade:
+            return None
+
+        start = time.perf_counter()
+        try:
+            chat_completion = await self._chat(
+                response_format={"type": "json_object"},
+                **dict(request, model=self.triage_model)
             )
+            choice = chat_completion.choices[0]
+            result, truncated = parse_json_checked(choice.message.content)
+            if self._is_truncated(truncated, getattr(choice, "finish_reason", None)):
+                raise ValueError("cavab kəsilib")
+            result = self._validate_analysis(result, include_contacts)
+            score = self._score(result)
+        except Exception as e:
+            logger.warning(f"Triage model output rejected, escalating: {str(e)}")
+            result, score = None, None
+        meta["latency"]["triage"] = round(time.perf_counter() - start, 3)
+        meta["triage_score"] = score
+
+        low, high = self.uncertainty_band
+        if score is None or low <= score <= high:
+            return None
+        # Bal zolaqdan kənardadırsa qərar da həmin tərəfə uyğun olmalıdır
+        expected = "qəbul" if score > high else "rədd"
+        if result["qərar"] != expected:
+            logger.warning(f"Triage decision '{result['qərar']}' contradicts score {score}, escalating")
+            return None
+        meta["tier"] = "triage"
+        return result
+
+    @staticmethod
+    def _cached_analysis(cache_key: str) -> Optional[Dict]:
+        cached = analysis_cache.get(cache_key)
+        if cached is None:
+            return None
+        logger.info(f"Analysis cache hit: {analysis_cache.stats()}")
+        result = json.loads(cached)
+        result.setdefault("_meta", {})["cached"] = True
+        return result
+
+    @staticmethod
+    def _fallback_analysis(error: Exception) -> Dict:
+        return {
+            "təhlil": "Xəta baş verdi",
+            "güclü_tərəflər": [],
+            "zəif_tərəflər": [],
+            "uyğunluq_faizi": "0",
+            "qərar": "rədd",
+            "məsləhətlər": ["Sistemdə texniki problem yarandı. Zəhmət olmasa daha sonra yenidən cəhd edin."],
+            "xəta": str(error)
+        }
+
+    async def analyze_resume(self, resume_text: str, role: str, use_cache: bool = True,
+                             include_contacts: bool = False) -> Dict:
+        """CV-ni təhlil edir və nəticəni qaytarır.
+
+        include_contacts=True olduqda cavabda "əlaqə" açarı ilə namizədin
+        əlaqə məlumatları da qaytarılır, ayrıca extract_email sorğusuna
+        ehtiyac qalmır. Kaskad rejimində "_meta" açarı qərarı verən pilləni
+        və hər pillənin gecikməsini saxlayır.
+        """
+        try:
+            # Regexlər, sıxılma və disk keşi bloklayandır: paylaşılan event loop-u tutmasın deyə thread-də
+            request, cache_key, prescreen = await asyncio.to_thread(
+                self._prepare_analysis, resume_text, role, include_contacts
+            )
+            prescreened = self._prescreened_analysis(prescreen, include_contacts)
+            if prescreened:
+                return prescreened
+            if use_cache:
+                cached = await asyncio.to_thread(self._cached_analysis, cache_key)
+                if cached is not None:
+                    return cached
+
+            meta = {"tier": None, "latency": {}}
+            triaged = await self._triage(request, include_contacts, meta)
+            if triaged is not None:
+                return await asyncio.to_thread(self._finalize_analysis, triaged, include_contacts, cache_key, meta)
+
+            # JSON rejimi modelin yalnız etibarlı JSON obyekti qaytarmasını tələb edir
+            start = time.perf_counter()
+            chat_completion = await self._chat(response_format={"type": "json_object"}, **request)
+            meta["latency"]["primary"] = round(time.perf_counter() - start, 3)
+            meta["tier"] = "primary"
             
-            response = chat_completion.choices[0].message.content
-            return json.loads(response)
+            choice = chat_completion.choices[0]
+            result, truncated = parse_json_checked(choice.message.content)
+            meta["truncated"] = self._is_truncated(truncated, getattr(choice, "finish_reason", None))
+            return await asyncio.to_thread(self._finalize_analysis, result, include_contacts, cache_key, meta)
             
         except Exception as e:
             logger.error(f"CV təhlili zamanı xəta: {str(e)}")
-            return {
-                "təhlil": "Xəta baş verdi",
-                "güclü_tərəflər": [],
-                "zəif_tərəflər": [],
-                "uyğunluq_faizi": "0",
-                "qərar": "rədd",
-                "məsləhətlər": ["Sistemdə texniki problem yarandı. Zəhmət olmasa daha sonra yenidən cəhd edin."]
-            }
+            return self._fallback_analysis(e)
+
+    async def analyze_resume_stream(self, resume_text: str, role: str, use_cache: bool = True,
+                                    include_contacts: bool = False) -> AsyncIterator[Dict]:
+        """Təhlili axınla alır və hər yeni sahə tamamlandıqca o ana qədərki nəticəni qaytarır.
+
+        Bal və qərar promptda birinci gəlir, ona görə uzun "təhlil" mətni
+        bitməzdən əvvəl göstərilə bilər. Sonuncu qaytarılan dəyər yoxlanmış
+        tam nəticədir (xəta halında fallback nəticə). Kaskad rejimində kiçik
+        modelin cavabı axınsız gözlənilir, axın yalnız böyük model üçündür.
+        """
+        try:
+            # Regexlər, sıxılma və disk keşi bloklayandır: paylaşılan event loop-u tutmasın deyə thread-də
+            request, cache_key, prescreen = await asyncio.to_thread(
+                self._prepare_analysis, resume_text, role, include_contacts
+            )
+            prescreened = self._prescreened_analysis(prescreen, include_contacts)
+            if prescreened:
+                yield prescreened
+                return
+            if use_cache:
+                cached = await asyncio.to_thread(self._cached_analysis, cache_key)
+                if cached is not None:
+                    yield cached
+                    return
+
+            meta = {"tier": None, "latency": {}}
+            triaged = await self._triage(request, include_contacts, meta)
+            if triaged is not None:
+                yield await asyncio.to_thread(self._finalize_analysis, triaged, include_contacts, cache_key, meta)
+                return
+
+            # Groq JSON rejimi axını dəstəkləmir, cavab tolerant parser ilə oxunur
+            start = time.perf_counter()
+            parser = StreamingJSONParser()
+            finish_reason = None
+            async for chunk in self._chat_stream(**request):
+                if chunk.choices and chunk.choices[0].finish_reason:
+                    finish_reason = chunk.choices[0].finish_reason
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta and parser.feed(delta):
+                    yield dict(parser.fields)
+            meta["latency"]["primary"] = round(time.perf_counter() - start, 3)
+            meta["tier"] = "primary"
+
+            result, truncated = parse_json_checked(parser.buffer)
+            meta["truncated"] = self._is_truncated(truncated, finish_reason)
+            yield await asyncio.to_thread(self._finalize_analysis, result, include_contacts, cache_key, meta)
+
+        except Exception as e:
+            logger.error(f"CV təhlili zamanı xəta: {str(e)}")
+            yield self._fallback_analysis(e)
+
+    async def extract_contacts(self, text: str) -> Dict:
+        """Əlaqə məlumatlarını lokal çıxarır, LLM-ə yalnız email tapılmadıqda və ya qeyri-müəyyən olduqda müraciət edir"""
+        contacts = await asyncio.to_thread(extract_contacts, text)
+        if contacts["email"] and not contacts["ambiguous"]:
+            return contacts
+
+        llm_email = await self._extract_email_llm(text, contacts["emails"])
+        if llm_email:
+            contacts["email"] = llm_email
+            contacts["ambiguous"] = False
+        return contacts
+
+    async def extract_contacts_with_analysis(self, text: str, role: str) -> Tuple[Dict, Optional[Dict]]:
+        """Əlaqə məlumatlarını qaytarır; lokal nəticə kifayət etmədikdə təhlil də eyni sorğuda aparılır.
+
+        Qaytarılan təhlil None ola bilər (lokal email kifayət etdi və ya sorğu uğursuz oldu),
+        bu halda analyze_resume sonradan ayrıca çağırılmalıdır.
+        """
+        contacts = await asyncio.to_thread(extract_contacts, text)
+        if contacts["email"] and not contacts["ambiguous"]:
+            return contacts, None
+
+        analysis = await self.analyze_resume(text, role, include_contacts=True)
+        if analysis.get("xəta"):
+            return contacts, None
+
+        llm_email = analysis["əlaqə"]["email"]
+        if not llm_email and analysis.get("ilkin_seçim"):
+            # İlkin seçim LLM-siz qərar verib, əlaqə məlumatı oxunmayıb
+            llm_email = await self._extract_email_llm(text, contacts["emails"])
+        if llm_email:
+            contacts["email"] = llm_email
+            contacts["ambiguous"] = False
+        return contacts, analysis
 
     async def extract_email(self, text: str) -> Optional[str]:
         """Mətndən email ünvanını çıxarır"""
+        contacts = await self.extract_contacts(text)
+        return contacts["email"]
+
+    async def _extract_email_llm(self, text: str, candidates: list) -> Optional[str]:
+        """Email ünvanını LLM vasitəsilə tapır"""
         try:
+            hint = ""
+            if candidates:
+                hint = f"Mümkün ünvanlar: {', '.join(candidates)}. Namizədin öz ünvanını seç."
+
             prompt = f"""
             Aşağıdakı mətndən email ünvanını tap və qaytar.
             Yalnız email ünvanını qaytar, əlavə mətn lazım deyil.
             Əgər email tapılmasa, boş string qaytar.
+            {hint}
 
             Mətn:
             {text}
             """
             
-            chat_completion = self.client.chat.completions.create(
+            chat_completion = await self._chat(
                 messages=[
                     {
                         "role": "user",
@@ -93,9 +552,9 @@ class GroqAgent:
                 max_tokens=100
             )
             
-            email = chat_completion.choices[0].message.content.strip()
-            return email if '@' in email else None
+            email = chat_completion.choices[0].message.content.strip().strip("\"'<>").lower()
+            return email if is_valid_email(email) else None
             
         except Exception as e:
             logger.error(f"Email çıxarılması zamanı xəta: {str(e)}")
-            return None
\ No newline at end of file
+            return None
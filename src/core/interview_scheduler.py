@@ -0,0 +1,221 @@
+import bisect
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pytz
+
+from src.config.settings import (
+    INTERVIEW_BUFFER_MINUTES,
+    INTERVIEW_DB,
+    INTERVIEW_HOLIDAYS,
+    INTERVIEW_HORIZON_DAYS,
+    INTERVIEW_MIN_NOTICE_HOURS,
+    INTERVIEW_SLOT_MINUTES,
+    INTERVIEW_WINDOWS,
+    INTERVIEW_WORKDAYS,
+    TIMEZONE,
+)
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interviews (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    candidate_email TEXT NOT NULL,
+    role TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'booked',
+    meeting_id TEXT,
+    join_url TEXT,
+    created_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS interviews_slot ON interviews (start_ts) WHERE status = 'booked';
+CREATE UNIQUE INDEX IF NOT EXISTS interviews_candidate ON interviews (candidate_email, role) WHERE status = 'booked';
+"""
+
+
+def parse_windows(spec: str) -> List[Tuple[int, int]]:
+    """"10:00-12:00,14:00-17:00" -> [(600, 720), (840, 1020)] (gün başlanğıcından dəqiqə)"""
+    windows = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        start, end = part.strip().split("-")
+        to_minutes = lambda value: int(value.split(":")[0]) * 60 + int(value.split(":")[1])
+        windows.append((to_minutes(start), to_minutes(end)))
+    return sorted(windows)
+
+
+class SlotAllocator:
+    """Müsahibə vaxtlarını müsahibəçinin iş saatlarına görə bölüşdürür.
+
+    Slotlar iş günlərindəki pəncərələrdən slot_minutes + buffer_minutes
+    addımı ilə yaradılır. Mövcud rezervasiyalar başlanğıc vaxtına görə
+    sıralanmış intervallar siyahısında saxlanılır və hər slotun boş olub
+    olmadığı bisect ilə O(log n) vaxtda yoxlanılır.
+
+    Rezervasiyalar SQLite-da saxlanılır. Bölüşdürmə BEGIN IMMEDIATE
+    tranzaksiyasında aparılır və aktiv rezervasiyalar üçün unikal indekslər
+    var, ona görə eyni anda rezerv edən iki sessiya (və ya proses) eyni
+    slotu ala bilməz. Eyni namizəd və vəzifə üçün ikinci sorğu mövcud
+    rezervasiyanı qaytarır.
+    """
+
+    def __init__(self, db_path: str = INTERVIEW_DB, windows: Sequence[Tuple[int, int]] = None,
+                 workdays: Iterable[int] = INTERVIEW_WORKDAYS, slot_minutes: int = INTERVIEW_SLOT_MINUTES,
+                 buffer_minutes: int = INTERVIEW_BUFFER_MINUTES, holidays: Iterable[date] = INTERVIEW_HOLIDAYS,
+                 horizon_days: int = INTERVIEW_HORIZON_DAYS, min_notice_hours: float = INTERVIEW_MIN_NOTICE_HOURS,
+                 timezone: str = TIMEZONE):
+        self.db_path = db_path
+        self.windows = list(windows) if windows is not None else parse_windows(INTERVIEW_WINDOWS)
+        self.workdays = set(workdays)
+        self.slot = timedelta(minutes=slot_minutes)
+        self.buffer = timedelta(minutes=buffer_minutes)
+        self.holidays = set(holidays)
+        self.horizon_days = horizon_days
+        self.min_notice = timedelta(hours=min_notice_hours)
+        self.tz = pytz.timezone(timezone)
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def candidate_slots(self, now: Optional[datetime] = None) -> List[datetime]:
+        """Horizont daxilində bütün mümkün slot başlanğıcları (rezervasiyalar nəzərə alınmadan)"""
+        now = now or datetime.now(self.tz)
+        earliest = now + self.min_notice
+        slots = []
+        for offset in range(self.horizon_days + 1):
+            day = (now + timedelta(days=offset)).date()
+            if day.weekday() not in self.workdays or day in self.holidays:
+                continue
+            for window_start, window_end in self.windows:
+                start = self.tz.localize(datetime.combine(day, datetime.min.time()) + timedelta(minutes=window_start))
+                end = self.tz.localize(datetime.combine(day, datetime.min.time()) + timedelta(minutes=window_end))
+                while start + self.slot <= end:
+                    if start >= earliest:
+                        slots.append(start)
+                    start += self.slot + self.buffer
+        return slots
+
+    def _is_free(self, starts: List[float], ends: List[float], start: float, end: float) -> bool:
+        # Bufer hər iki tərəfdən tətbiq olunur ki, konfiqurasiya dəyişsə də rezervasiyalar yapışmasın
+        buffer = self.buffer.total_seconds()
+        i = bisect.bisect_left(starts, end + buffer)
+        return i == 0 or ends[i - 1] + buffer <= start
+
+    def _row_to_booking(self, row: sqlite3.Row) -> Dict:
+        return {
+            "id": row["id"],
+            "candidate_email": row["candidate_email"],
+            "role": row["role"],
+            "start": datetime.fromtimestamp(row["start_ts"], self.tz),
+            "end": datetime.fromtimestamp(row["end_ts"], self.tz),
+            "meeting_id": row["meeting_id"],
+            "join_url": row["join_url"]
+        }
+
+    def allocate(self, candidate_emails: List[str], role: str, now: Optional[datetime] = None) -> List[Dict]:
+        """Bütün shortlist üçün bir keçiddə ən erkən boş slotları ayırır.
+
+        Nəticə candidate_emails sırası ilə qaytarılır; boş slot qalmayan
+        namizəd üçün None olur. Namizədin gələcəkdəki rezervasiyası varsa o
+        qaytarılır, keçmiş rezervasiyalar 'completed' olaraq qeyd edilir.
+        """
+        emails = [email.strip().lower() for email in candidate_emails]
+        now = now or datetime.now(self.tz)
+        slots = self.candidate_slots(now)
+
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Bitmiş müsahibələr aktiv sayılmır: namizəd yenidən seçilərsə ona yeni slot
+            # verilir (unikal indeks yalnız 'booked' qeydlərə aiddir)
+            conn.execute(
+                "UPDATE interviews SET status = 'completed' WHERE status = 'booked' AND end_ts <= ?",
+                (now.timestamp(),)
+            )
+            existing = {
+                row["candidate_email"]: row for row in conn.execute(
+                    "SELECT * FROM interviews WHERE status = 'booked' AND role = ?", (role,)
+                )
+            }
+            booked = conn.execute(
+                "SELECT start_ts, end_ts FROM interviews WHERE status = 'booked' ORDER BY start_ts"
+            ).fetchall()
+            starts = [row["start_ts"] for row in booked]
+            ends = [row["end_ts"] for row in booked]
+
+            free = iter(
+                slot for slot in slots
+                if self._is_free(starts, ends, slot.timestamp(), (slot + self.slot).timestamp())
+            )
+
+            results = []
+            for email in emails:
+                if email in existing:
+                    results.append(self._row_to_booking(existing[email]))
+                    continue
+
+                slot = next(free, None)
+                if slot is None:
+                    logger.warning(f"No free interview slot left for {email}")
+                    results.append(None)
+                    continue
+
+                cursor = conn.execute(
+                    "INSERT INTO interviews (candidate_email, role, start_ts, end_ts, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (email, role, slot.timestamp(), (slot + self.slot).timestamp(), time.time())
+                )
+                row = conn.execute("SELECT * FROM interviews WHERE id = ?", (cursor.lastrowid,)).fetchone()
+                existing[email] = row
+                results.append(self._row_to_booking(row))
+
+        logger.info(f"Allocated {sum(r is not None for r in results)}/{len(results)} interview slots for {role}")
+        return results
+
+    def allocate_one(self, candidate_email: str, role: str) -> Optional[Dict]:
+        return self.allocate([candidate_email], role)[0]
+
+    def attach_meeting(self, booking_id: int, meeting_id, join_url: str):
+        """Rezervasiyaya yaradılmış Zoom görüşünü bağlayır (təkrar klikdə görüş yenidən yaradılmasın)"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE interviews SET meeting_id = ?, join_url = ? WHERE id = ?",
+                (str(meeting_id), join_url, booking_id)
+            )
+
+    def release(self, booking_id: int):
+        """Slotu azad edir (məs. Zoom görüşü yaradıla bilmədikdə)"""
+        with self._connect() as conn:
+            conn.execute("UPDATE interviews SET status = 'cancelled' WHERE id = ?", (booking_id,))
+
+
+_allocator = None
+_allocator_lock = threading.Lock()
+
+
+def get_slot_allocator() -> SlotAllocator:
+    global _allocator
+    with _allocator_lock:
+        if _allocator is None:
+            _allocator = SlotAllocator()
+        return _allocator
@@ -0,0 +1,179 @@
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.config.constants import ROLE_REQUIREMENTS
+from src.config.settings import PRESCREEN_REJECT_BELOW, PRESCREEN_SHORTLIST_ABOVE
+
+# Kanonik bacarıq adı -> CV və tələblərdə rast gəlinən yazılışlar.
+# Adi sözlə üst-üstə düşən yazılışlar ("rest", "express", "node", "lambda",
+# "ml", "js") yalnız kontekstlə verilir, əks halda texniki olmayan CV-lər bal toplayır.
+SKILL_SYNONYMS = {
+    "python": ["python"],
+    "java": ["java"],
+    "node.js": ["node.js", "nodejs"],
+    "javascript": ["javascript", "es6", "ecmascript"],
+    "typescript": ["typescript"],
+    "html": ["html", "html5"],
+    "css": ["css", "css3", "scss", "sass"],
+    "react": ["React", "react.js", "reactjs", "react native"],
+    "vue": ["vue", "vue.js", "vuejs"],
+    "angular": ["Angular", "angularjs"],
+    "redux": ["redux"],
+    "vuex": ["vuex", "pinia"],
+    "context api": ["context api"],
+    "jest": ["jest"],
+    "cypress": ["cypress"],
+    "responsive design": ["responsive design", "responsive web design", "responsive layout", "mobile-first"],
+    "cross-browser": ["cross-browser", "cross browser"],
+    "ui/ux": ["ui/ux", "ux", "user experience", "design systems", "design system", "figma"],
+    "web performance": ["performance optimization", "web performance", "lighthouse"],
+    "web security": ["security best practices", "xss", "csrf", "owasp"],
+    "pytorch": ["pytorch", "torch"],
+    "tensorflow": ["tensorflow", "keras"],
+    "machine learning": ["machine learning", "ml engineer", "ml models", "scikit-learn", "sklearn"],
+    "deep learning": ["deep learning", "neural networks", "neural network"],
+    "cnn": ["cnn", "cnns", "convolutional"],
+    "rnn": ["rnn", "rnns", "lstm", "gru"],
+    "transformers": ["transformers", "transformer", "bert", "hugging face", "huggingface"],
+    "mlops": ["mlops", "mlflow", "kubeflow", "model deployment", "model monitoring"],
+    "rag": ["rag", "retrieval-augmented generation", "retrieval augmented generation", "vector database"],
+    "llm": ["llm", "llms", "large language models", "large language model", "gpt", "langchain"],
+    "fine-tuning": ["fine-tuning", "fine tuning", "finetuning", "lora", "peft"],
+    "feature engineering": ["feature engineering", "data preprocessing", "pandas", "numpy"],
+    "model evaluation": ["model evaluation", "cross-validation", "cross validation"],
+    "rest api": [
+        "rest api", "rest apis", "restful", "restful api", "restful apis",
+        "fastapi", "flask", "django", "spring boot", "express.js", "expressjs"
+    ],
+    "microservices": ["microservices", "microservice"],
+    "postgresql": ["postgresql", "postgres", "mysql", "sql"],
+    "mongodb": ["mongodb", "nosql", "redis", "cassandra"],
+    "aws": ["aws", "amazon web services"],
+    "azure": ["azure"],
+    "gcp": ["gcp", "google cloud"],
+    "serverless": ["serverless", "aws lambda", "lambda functions", "cloud functions"],
+    "docker": ["docker", "containerization", "containerized"],
+    "kubernetes": ["kubernetes", "k8s", "helm chart", "helm charts"],
+    "oauth": ["oauth", "oauth2", "openid connect"],
+    "jwt": ["jwt", "json web token"],
+    "ci/cd": ["ci/cd", "ci cd", "github actions", "gitlab ci", "jenkins", "continuous integration"],
+    "devops": ["devops", "terraform", "ansible"]
+}
+
+# Felə/sifətə çevrilən adlar ("react to", "angular momentum") yalnız yazıldığı registrdə tanınır
+_CASE_SENSITIVE = {"React", "Angular"}
+
+
+def _compile(synonyms: List[str]) -> re.Pattern:
+    # \b "node.js", "ci/cd" kimi simvollu adlarda işləmədiyi üçün ətraf yoxlanılır
+    alternatives = "|".join(
+        f"(?-i:{re.escape(s)})" if s in _CASE_SENSITIVE else re.escape(s)
+        for s in sorted(synonyms, key=len, reverse=True)
+    )
+    # "/" ayırıcı sayılır: "OAuth2/JWT" həm oauth, həm jwt verir
+    return re.compile(rf"(?<![\w.+#-])(?:{alternatives})(?![\w+#]|\.\w)", re.IGNORECASE)
+
+
+def requirement_lines(requirements: str) -> List[str]:
+    """Tələb mətnindəki "- ..." bəndləri; bənd yoxdursa boş olmayan sətirlər"""
+    lines = [line.strip() for line in requirements.splitlines() if line.strip()]
+    bullets = [line.lstrip("-•* ").strip() for line in lines if line[0] in "-•*"]
+    return bullets or lines
+
+
+class PreScreener:
+    """CV-ləri LLM-siz, açar söz vektorları ilə vəzifə tələblərinə qarşı qiymətləndirir.
+
+    Vəzifə tələblərinin hər bəndi ("Python, Java və ya Node.js") ondakı
+    bacarıqlardan ibarət "biri kifayətdir" qrupudur. CV-lər (N x V)
+    tezlik matrisinə çevrilir, qruplar (G x V) üzvlük matrisi ilə, vəzifələr
+    isə (M x G) matrisi ilə verilir; bal ödənilmiş bəndlərin payıdır və
+    bütün CV-lər üçün matris hasilləri ilə hesablanır.
+    """
+
+    def __init__(self, role_requirements: Dict[str, str] = ROLE_REQUIREMENTS,
+                 reject_below: Optional[float] = PRESCREEN_REJECT_BELOW,
+                 shortlist_above: Optional[float] = PRESCREEN_SHORTLIST_ABOVE):
+        self.skills = list(SKILL_SYNONYMS.keys())
+        self.patterns = [_compile(SKILL_SYNONYMS[skill]) for skill in self.skills]
+        self.roles = list(role_requirements.keys())
+        self.reject_below = reject_below
+        self.shortlist_above = shortlist_above
+
+        lines = [requirement_lines(text) for text in role_requirements.values()]
+        flat = [line for role_lines in lines for line in role_lines]
+        members = self.vectorize(flat) > 0
+        # Bacarıq adı olmayan bəndlər ("problem-solving") yoxlanıla bilmir
+        has_skill = members.any(axis=1)
+
+        self.groups = members[has_skill].astype(np.float32)
+        self.group_labels = [
+            " / ".join(skill for skill, member in zip(self.skills, row) if member)
+            for row in members[has_skill]
+        ]
+        owner = np.repeat(np.arange(len(self.roles)), [len(role_lines) for role_lines in lines])[has_skill]
+        self.role_groups = (owner[None, :] == np.arange(len(self.roles))[:, None]).astype(np.float32)
+        self.role_totals = self.role_groups.sum(axis=1)
+
+    def vectorize(self, texts: List[str]) -> np.ndarray:
+        """Mətnləri (N x V) bacarıq tezliyi matrisinə çevirir"""
+        counts = np.zeros((len(texts), len(self.skills)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for column, pattern in enumerate(self.patterns):
+                counts[row, column] = len(pattern.findall(text))
+        return counts
+
+    def _group_hits(self, counts: np.ndarray) -> np.ndarray:
+        """(N x G): CV qrupdakı bacarıqlardan ən azı birini ehtiva edirmi"""
+        return ((counts > 0).astype(np.float32) @ self.groups.T) > 0
+
+    def _scores(self, hits: np.ndarray) -> np.ndarray:
+        totals = np.where(self.role_totals > 0, self.role_totals, 1.0)
+        return (hits.astype(np.float32) @ self.role_groups.T) / totals
+
+    def score_matrix(self, resume_texts: List[str]) -> np.ndarray:
+        """N CV-ni M vəzifəyə qarşı bir əməliyyatla qiymətləndirir (0-1, N x M)"""
+        return self._scores(self._group_hits(self.vectorize(resume_texts)))
+
+    def evaluate(self, resume_text: str, role: str) -> Dict:
+        """Bir CV üçün bal, ödənilmiş/ödənilməmiş tələb bəndləri və avtomatik qərar"""
+        role_index = self.roles.index(role)
+        counts = self.vectorize([resume_text])
+        hits = self._group_hits(counts)
+        score = float(self._scores(hits)[0, role_index])
+        present = counts[0] > 0
+
+        matched, missing = [], []
+        for group, label, hit, owned in zip(self.groups, self.group_labels, hits[0], self.role_groups[role_index]):
+            if not owned:
+                continue
+            if hit:
+                matched.extend(skill for skill, member, p in zip(self.skills, group, present) if member and p)
+            else:
+                missing.append(label)
+
+        decision = None
+        if self.reject_below is not None and score < self.reject_below:
+            decision = "rədd"
+        elif self.shortlist_above is not None and score >= self.shortlist_above:
+            decision = "qəbul"
+
+        return {
+            "score": score,
+            "matched": list(dict.fromkeys(matched)),
+            "missing": missing,
+            "decision": decision
+        }
+
+
+_prescreener = None
+
+
+def get_prescreener() -> PreScreener:
+    """Lüğət və regexlər bir dəfə qurulur"""
+    global _prescreener
+    if _prescreener is None:
+        _prescreener = PreScreener()
+    return _prescreener
@@ -0,0 +1,201 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Optional
+
+from src.config.settings import (
+    GROQ_MAX_RETRIES,
+    GROQ_REQUESTS_PER_MINUTE,
+    GROQ_TOKENS_PER_MINUTE,
+)
+from src.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+
+class RequestScheduler:
+    """Groq sorğuları üçün ümumi növbə.
+
+    - Dəqiqəlik sorğu (RPM) və token (TPM) limitləri üçün iki token bucket
+    - Prioritet növbəsi: interaktiv sorğular toplu sorğulardan əvvəl
+    - 429/5xx xətalarında Retry-After-ə hörmət edən eksponensial backoff + jitter
+    - Eyni anda gedən eyni sorğuların birləşdirilməsi (single flight)
+
+    Növbə və limitlər thread-safe-dir və event loop-a bağlı deyil, ona görə
+    bir obyekt bütün Streamlit sessiyaları və toplu işlər arasında paylaşılır.
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float,
+                 max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._queue = []
+        self._counter = itertools.count()
+        self._inflight: Dict[str, Future] = {}
+        self._wait_times = deque(maxlen=1000)
+        self._stats = {"completed": 0, "failed": 0, "retries": 0, "rate_limited": 0, "merged": 0}
+
+    async def _acquire(self, priority: int, tokens: int):
+        """Növbədə öz sırasını və limitlərdə yer olmasını gözləyir"""
+        ticket = (priority, next(self._counter))
+        start = time.monotonic()
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+
+        try:
+            while True:
+                with self._lock:
+                    if self._queue[0] == ticket:
+                        wait = max(self.request_bucket.wait_time(1), self.token_bucket.wait_time(tokens))
+                        if wait == 0:
+                            self.request_bucket.consume(1)
+                            self.token_bucket.consume(tokens)
+                            heapq.heappop(self._queue)
+                            self._wait_times.append(time.monotonic() - start)
+                            return
+                    else:
+                        wait = self.POLL_INTERVAL
+                await asyncio.sleep(min(max(wait, self.POLL_INTERVAL), 1.0))
+        except BaseException:
+            # Ləğv edilmiş sorğu növbəni bloklamamalıdır
+            with self._lock:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+            raise
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        value = headers.get("retry-after")
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        status = getattr(error, "status_code", None)
+        if status is None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+        if status is not None:
+            return status == 429 or status >= 500
+        # Bağlantı və timeout xətalarının status kodu olmur
+        return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def _run(self, call: Callable[[], Awaitable], priority: int, tokens: int):
+        attempt = 0
+        while True:
+            await self._acquire(priority, tokens)
+            try:
+                result = await call()
+                with self._lock:
+                    self._stats["completed"] += 1
+                return result
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    with self._lock:
+                        self._stats["failed"] += 1
+                    raise
+
+                retry_after = self._retry_after(e)
+                if getattr(e, "status_code", None) == 429:
+                    with self._lock:
+                        self._stats["rate_limited"] += 1
+                    if retry_after:
+                        # Server limiti bütün sorğular üçün keçərlidir
+                        self.request_bucket.pause(retry_after)
+
+                delay = self._backoff(attempt, retry_after)
+                attempt += 1
+                with self._lock:
+                    self._stats["retries"] += 1
+                logger.warning(f"Groq request failed ({str(e)}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def submit(self, call: Callable[[], Awaitable], priority: int = PRIORITY_INTERACTIVE,
+                     tokens: int = 1, dedup_key: Optional[str] = None):
+        """Sorğunu növbəyə qoyur və nəticəsini qaytarır.
+
+        dedup_key verilərsə və eyni açarlı sorğu artıq icra olunursa, yeni
+        sorğu göndərilmir, mövcud sorğunun nəticəsi gözlənilir.
+        """
+        if dedup_key is None:
+            return await self._run(call, priority, tokens)
+
+        with self._lock:
+            future = self._inflight.get(dedup_key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[dedup_key] = future
+            else:
+                self._stats["merged"] += 1
+
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await self._run(call, priority, tokens)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(dedup_key, None)
+
+    def metrics(self) -> Dict:
+        """Növbə dərinliyi, gözləmə müddətləri və sayğaclar"""
+        with self._lock:
+            waits = sorted(self._wait_times)
+            metrics = dict(self._stats)
+            metrics.update({
+                "queue_depth": len(self._queue),
+                "inflight_keys": len(self._inflight),
+                "wait_avg_s": sum(waits) / len(waits) if waits else 0.0,
+                "wait_p95_s": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                "wait_max_s": waits[-1] if waits else 0.0
+            })
+            return metrics
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """Proses üzrə paylaşılan planlayıcı"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(
+                GROQ_REQUESTS_PER_MINUTE,
+                GROQ_TOKENS_PER_MINUTE,
+                max_retries=GROQ_MAX_RETRIES
+            )
+        return _scheduler
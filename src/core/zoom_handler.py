@@ -1,96 +1,204 @@
+import asyncio
 import logging
 import json
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 import os
-from dotenv import load_dotenv
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 import base64
 import streamlit as st
-
-# .env faylını yüklə
-load_dotenv()
+from src.config.settings import (
+    ZOOM_BULK_CONCURRENCY,
+    ZOOM_CONNECT_TIMEOUT,
+    ZOOM_MAX_RETRIES,
+    ZOOM_POOL_SIZE,
+    ZOOM_READ_TIMEOUT,
+    ZOOM_REQUESTS_PER_SECOND,
+    ZOOM_TOKEN_HEDGE_DELAY,
+    ZOOM_TOKEN_REFRESH_MARGIN,
+)
+from src.utils.hedging import hedged_sync
+from src.utils.rate_limit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+ZOOM_TOKEN_URL = "https://zoom.us/oauth/token"
+
+# Bütün Zoom sorğuları üçün ümumi bağlantı hovuzu (TLS bağlantıları təkrar istifadə olunur)
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=ZOOM_POOL_SIZE))
+
+
+class ZoomTokenManager:
+    """Bir Zoom hesabı üçün OAuth tokenini prosesdə keşləyir.
+
+    Token expires_in bitməzdən refresh_margin saniyə əvvələ qədər təkrar
+    istifadə olunur. Yeniləmə kilid altında aparılır, ona görə eyni anda
+    gələn sorğular tək bir token sorğusu gözləyir.
+    """
+
+    def __init__(self, account_id: str, client_id: str, client_secret: str,
+                 refresh_margin: float = ZOOM_TOKEN_REFRESH_MARGIN):
+        self.account_id = account_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_margin = refresh_margin
+        self.timeout = (ZOOM_CONNECT_TIMEOUT, ZOOM_READ_TIMEOUT)
+
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fetch(self) -> Tuple[str, float]:
+        credentials = f"{self.client_id}:{self.client_secret}"
+        encoded_credentials = base64.b64encode(credentials.encode()).decode()
+
+        headers = {
+            'Authorization': f'Basic {encoded_credentials}',
+            'Content-Type': 'application/x-www-form-urlencoded'
+        }
+
+        data = {
+            'grant_type': 'account_credentials',
+            'account_id': self.account_id
+        }
+
+        # Token sorğusu idempotentdir, ona görə gecikəndə dublikatı göndərilə bilər
+        response = hedged_sync(
+            lambda: _http.post(ZOOM_TOKEN_URL, headers=headers, data=data, timeout=self.timeout),
+            ZOOM_TOKEN_HEDGE_DELAY
+        )
+
+        if response.status_code != 200:
+            raise Exception(f"Token response: {response.status_code} - {response.text}")
+
+        token_data = response.json()
+        return token_data['access_token'], float(token_data.get('expires_in', 3600))
+
+    def get_token(self, stale_token: Optional[str] = None) -> str:
+        """Keşlənmiş tokeni qaytarır, vaxtı çatıbsa yeniləyir.
+
+        stale_token 401 almış tokendir: yalnız hələ də keşdə o varsa yenilənir,
+        başqa thread artıq yeniləyibsə yeni token qaytarılır.
+        """
+        with self._lock:
+            expired = time.monotonic() >= self._expires_at - self.refresh_margin
+            if self._token and not expired and (stale_token is None or stale_token != self._token):
+                return self._token
+
+            token, expires_in = self._fetch()
+            self._token = token
+            self._expires_at = time.monotonic() + expires_in
+            logger.info(f"Zoom token refreshed, valid for {int(expires_in)}s")
+            return token
+
+
+_token_managers: Dict[Tuple[str, str], ZoomTokenManager] = {}
+_token_managers_lock = threading.Lock()
+
+
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def _get_bucket(account_id: str) -> TokenBucket:
+    """Zoom limiti hesab üzrədir, ona görə bütün sessiyalar eyni bucket-i paylaşır"""
+    with _token_managers_lock:
+        bucket = _buckets.get(account_id)
+        if bucket is None:
+            # Partlama tutumu bir saniyəlik limitdir
+            bucket = TokenBucket(ZOOM_REQUESTS_PER_SECOND * 60, capacity=ZOOM_REQUESTS_PER_SECOND)
+            _buckets[account_id] = bucket
+        return bucket
+
+
+def get_token_manager(account_id: str, client_id: str, client_secret: str) -> ZoomTokenManager:
+    """Hesab və client id üzrə proses səviyyəsində bir token meneceri"""
+    key = (account_id, client_id)
+    with _token_managers_lock:
+        manager = _token_managers.get(key)
+        if manager is None or manager.client_secret != client_secret:
+            manager = ZoomTokenManager(account_id, client_id, client_secret)
+            _token_managers[key] = manager
+        return manager
+
+
 class CustomZoomTool:
     def __init__(self, account_id, client_id, client_secret):
         # Konfiqurasiya məlumatlarını yoxla
         self.account_id = account_id or os.getenv("ZOOM_ACCOUNT_ID")
         self.client_id = client_id or os.getenv("ZOOM_CLIENT_ID")
         self.client_secret = client_secret or os.getenv("ZOOM_CLIENT_SECRET")
-        
+
         if not all([self.account_id, self.client_id, self.client_secret]):
             logger.error("Zoom konfiqurasiyası tapılmadı!")
             st.sidebar.error("Zoom konfiqurasiyasını tamamlayın!")
             raise ValueError("Zoom məlumatları .env faylında tapılmadı")
-            
+
         self.base_url = "https://api.zoom.us/v2"
         self.token = None
+        self.timeout = (ZOOM_CONNECT_TIMEOUT, ZOOM_READ_TIMEOUT)
+        # Token handler-lər arasında paylaşılır, hər görüş üçün yenidən alınmır
+        self.token_manager = get_token_manager(self.account_id, self.client_id, self.client_secret)
 
-    def get_access_token(self):
+    def get_access_token(self, stale_token: Optional[str] = None):
         """Zoom API access token əldə edir"""
         try:
-            url = "https://zoom.us/oauth/token"
-            
-            credentials = f"{self.client_id}:{self.client_secret}"
-            encoded_credentials = base64.b64encode(credentials.encode()).decode()
-
-            headers = {
-                'Authorization': f'Basic {encoded_credentials}',
-                'Content-Type': 'application/x-www-form-urlencoded'
-            }
-
-            data = {
-                'grant_type': 'account_credentials',
-                'account_id': self.account_id
-            }
-
-            response = requests.post(url, headers=headers, data=data)
-            
-            if response.status_code == 200:
-                token_data = response.json()
-                self.token = token_data['access_token']
-                return self.token
-            else:
-                error_msg = f"Token response: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                st.error("Zoom API xətası: Token alına bilmədi")
-                raise Exception(error_msg)
+            self.token = self.token_manager.get_token(stale_token)
+            return self.token
 
         except Exception as e:
             logger.error(f"Zoom token xətası: {str(e)}")
+            st.error("Zoom API xətası: Token alına bilmədi")
             raise
 
+    def _post_meeting(self, token, meeting_data):
+        headers = {
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        }
+        # Görüş yaratmaq idempotent deyil: dublikat ikinci görüş yaradar, hedging yoxdur
+        return _http.post(
+            f"{self.base_url}/users/me/meetings",
+            headers=headers,
+            json=meeting_data,
+            timeout=self.timeout
+        )
+
+    @staticmethod
+    def _meeting_payload(meeting_details):
+        return {
+            "topic": meeting_details["topic"],
+            "type": 2,
+            "start_time": meeting_details["start_time"],
+            "duration": meeting_details["duration"],
+            "timezone": meeting_details["timezone"],
+            "settings": {
+                "host_video": True,
+                "participant_video": True,
+                "join_before_host": True,
+                "waiting_room": True,
+                "auto_recording": "none"
+            }
+        }
+
     async def create_meeting(self, meeting_details):
         """Zoom görüşü yaradır"""
         try:
-            if not self.token:
-                self.token = self.get_access_token()
+            token = self.get_access_token()
+            meeting_data = self._meeting_payload(meeting_details)
 
-            url = f"{self.base_url}/users/me/meetings"
+            response = self._post_meeting(token, meeting_data)
+            if response.status_code == 401:
+                # Token vaxtından əvvəl ləğv edilib; bir dəfə yenilənib təkrarlanır.
+                # 401 cavabında görüş yaradılmadığı üçün təkrar təhlükəsizdir
+                logger.info("Zoom returned 401, refreshing token")
+                token = self.get_access_token(stale_token=token)
+                response = self._post_meeting(token, meeting_data)
 
-            headers = {
-                'Authorization': f'Bearer {self.token}',
-                'Content-Type': 'application/json'
-            }
-
-            meeting_data = {
-                "topic": meeting_details["topic"],
-                "type": 2,
-                "start_time": meeting_details["start_time"],
-                "duration": meeting_details["duration"],
-                "timezone": meeting_details["timezone"],
-                "settings": {
-                    "host_video": True,
-                    "participant_video": True,
-                    "join_before_host": True,
-                    "waiting_room": True,
-                    "auto_recording": "none"
-                }
-            }
-
-            response = requests.post(url, headers=headers, json=meeting_data)
-            
             if response.status_code in [200, 201]:
                 data = response.json()
                 return {
@@ -106,4 +214,100 @@ class CustomZoomTool:
 
         except Exception as e:
             logger.error(f"Zoom görüş yaratma xətası: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    async def _create_meeting_async(self, client: httpx.AsyncClient, bucket: TokenBucket,
+                                    semaphore: asyncio.Semaphore, meeting_details: Dict) -> Dict:
+        meeting_data = self._meeting_payload(meeting_details)
+        token = self.token
+        refreshed = False
+        attempt = 0
+
+        async with semaphore:
+            while True:
+                wait = bucket.try_acquire()
+                while wait > 0:
+                    await asyncio.sleep(wait)
+                    wait = bucket.try_acquire()
+
+                try:
+                    response = await client.post(
+                        f"{self.base_url}/users/me/meetings",
+                        headers={'Authorization': f'Bearer {token}'},
+                        json=meeting_data
+                    )
+                except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                    # Sorğu serverə çatmayıb, təkrar ikinci görüş yaratmaz
+                    if attempt >= ZOOM_MAX_RETRIES:
+                        raise
+                    attempt += 1
+                    logger.warning(f"Zoom connect error, retrying: {str(e)}")
+                    await asyncio.sleep(min(30, 2 ** attempt))
+                    continue
+
+                if response.status_code == 429 and attempt < ZOOM_MAX_RETRIES:
+                    attempt += 1
+                    try:
+                        retry_after = float(response.headers.get("Retry-After", ""))
+                    except ValueError:
+                        retry_after = min(30, 2 ** attempt)
+                    # Bütün paralel sorğular dayansın deyə bucket da dayandırılır
+                    bucket.pause(retry_after)
+                    logger.warning(f"Zoom rate limited, retrying in {retry_after}s")
+                    continue
+
+                if response.status_code == 401 and not refreshed:
+                    refreshed = True
+                    token = await asyncio.to_thread(self.token_manager.get_token, token)
+                    continue
+
+                if response.status_code in [200, 201]:
+                    data = response.json()
+                    return {
+                        "ok": True,
+                        "join_url": data['join_url'],
+                        "meeting_id": data['id'],
+                        "start_url": data.get('start_url')
+                    }
+                raise Exception(f"Meeting creation failed: {response.status_code} - {response.text}")
+
+    async def create_meetings(self, meetings: List[Dict], concurrency: int = ZOOM_BULK_CONCURRENCY) -> List[Dict]:
+        """Bir neçə görüşü paralel yaradır.
+
+        Sorğular ümumi async HTTP klienti ilə, ən çox concurrency paralel və
+        hesab üzrə token bucket limiti ilə göndərilir; 429 cavabında
+        Retry-After gözlənilir. Xəta birinci uğursuzluqda qaldırılmır:
+        nəticə meetings sırası ilə hər görüş üçün {"ok": True, ...} və ya
+        {"ok": False, "error": ...} olur. meeting_details-dəki
+        "candidate_email" nəticəyə köçürülür.
+        """
+        if not meetings:
+            return []
+
+        try:
+            self.token = await asyncio.to_thread(self.token_manager.get_token)
+        except Exception as e:
+            logger.error(f"Zoom token xətası: {str(e)}")
+            return [{"ok": False, "candidate_email": m.get("candidate_email"), "error": str(e)} for m in meetings]
+
+        bucket = _get_bucket(self.account_id)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        timeout = httpx.Timeout(ZOOM_READ_TIMEOUT, connect=ZOOM_CONNECT_TIMEOUT)
+
+        async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+            outcomes = await asyncio.gather(
+                *(self._create_meeting_async(client, bucket, semaphore, m) for m in meetings),
+                return_exceptions=True
+            )
+
+        results = []
+        for meeting_details, outcome in zip(meetings, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Zoom görüş yaratma xətası: {str(outcome)}")
+                outcome = {"ok": False, "error": str(outcome)}
+            outcome["candidate_email"] = meeting_details.get("candidate_email")
+            results.append(outcome)
+
+        logger.info(f"Bulk Zoom meetings: {sum(r['ok'] for r in results)}/{len(results)} created")
+        return results
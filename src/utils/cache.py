@@ -0,0 +1,139 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Fayl sistemində saxlanan, ölçü limitli və LRU təmizləməli keş.
+
+    Hər açar ayrıca faylda saxlanır. Yazılar müvəqqəti fayl + os.replace ilə
+    atomik aparılır, ona görə eyni qovluğu bir neçə Streamlit prosesi
+    paylaşa bilər. mtime yazılma vaxtını (TTL üçün), atime isə son oxunma
+    vaxtını (LRU üçün) saxlayır; təmizləmə zamanı ən köhnə istifadə
+    olunmuş fayllar silinir.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ".txt", ttl: Optional[float] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content: bytes, **settings) -> str:
+        """Məzmunun SHA-256-sı və emal tənzimləmələrindən açar yaradır"""
+        digest = hashlib.sha256(content).hexdigest()
+        params = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(f"{digest}:{params}".encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            now = time.time()
+            if self.ttl is not None and now - stat.st_mtime > self.ttl:
+                os.unlink(path)
+                raise FileNotFoundError(path)
+
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+            # LRU üçün son istifadə vaxtını yenilə, yazılma vaxtı dəyişmir
+            os.utime(path, (now, stat.st_mtime))
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except OSError as e:
+            logger.warning(f"Cache read error: {str(e)}")
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(value)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Cache write error: {str(e)}")
+            return
+
+        self._evict()
+
+    def _evict(self):
+        """Ümumi ölçü limiti aşdıqda ən köhnə faylları silir"""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(self.suffix):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_atime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError as e:
+            logger.warning(f"Cache eviction error: {str(e)}")
+            return
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                # Başqa proses artıq silib
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Keşdəki bütün faylları silir"""
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(self.suffix):
+                        try:
+                            os.unlink(entry.path)
+                        except FileNotFoundError:
+                            pass
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
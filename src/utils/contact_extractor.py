@@ -0,0 +1,165 @@
+import re
+from typing import Dict, List, Optional
+
+# OCR-da tez-tez rast gəlinən email yazılışları: "ad (at) mail . com", "ad [at] mail [dot] com"
+_AT_PATTERN = re.compile(r"\s*(?:\(\s*at\s*\)|\[\s*at\s*\]|\{\s*at\s*\}|\s@\s|@\s+|\s+@)\s*", re.IGNORECASE)
+_DOT_PATTERN = re.compile(r"\s*(?:\(\s*dot\s*\)|\[\s*dot\s*\]|\{\s*dot\s*\})\s*", re.IGNORECASE)
+# "gmail . com" -> "gmail.com" (yalnız @-dən sonrakı domen hissəsində)
+_DOMAIN_SPACE_PATTERN = re.compile(r"(@[A-Za-z0-9-]+)\s*\.\s*(com|net|org|edu|gov|info|io|ai|dev|me|co|az|ru|tr|uk|de)\b")
+
+_EMAIL_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9._%+-]*@[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?(?:\.[A-Za-z0-9-]+)*\.[A-Za-z0-9]{2,24}")
+# Ayırıcılar yalnız boşluq/tab: sətir keçidi ayrı-ayrı rəqəmləri birləşdirməməlidir
+_PHONE_PATTERN = re.compile(r"(?<![\w+])(\+?\(?\d[\d \t().-]{6,}\d)(?!\w)")
+# Telefon olmayan hissələr: il, MM.YYYY / MM/YYYY, versiya (3.10, 1.2.3)
+_NOT_PHONE_PART = re.compile(r"(?:(?:0?[1-9]|1[0-2])[./])?(?:19|20)\d{2}|\d{1,2}(?:\.\d{1,3}){1,2}")
+_LINKEDIN_PATTERN = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[A-Za-z0-9_%-]+/?", re.IGNORECASE)
+_GITHUB_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})(?:/[A-Za-z0-9._-]+)?/?", re.IGNORECASE)
+
+KNOWN_DOMAINS = {
+    "gmail.com", "googlemail.com", "yahoo.com", "outlook.com", "hotmail.com", "live.com",
+    "icloud.com", "mail.ru", "yandex.ru", "yandex.com", "bk.ru", "inbox.ru", "list.ru",
+    "protonmail.com", "proton.me", "mail.az", "box.az", "aol.com", "gmx.com"
+}
+_PLACEHOLDER_DOMAINS = {"example.com", "email.com", "domain.com", "mail.com"}
+# OCR-un rəqəm/hərf qarışıqlığı: 0<->o, 1<->l, 5<->s
+_OCR_CONFUSIONS = str.maketrans({"0": "o", "1": "l", "5": "s"})
+_GITHUB_RESERVED = {"features", "pricing", "about", "login", "join", "orgs", "topics", "marketplace"}
+
+
+def _normalize_ocr(text: str) -> str:
+    text = _AT_PATTERN.sub("@", text)
+    text = _DOT_PATTERN.sub(".", text)
+    return _DOMAIN_SPACE_PATTERN.sub(r"\1.\2", text)
+
+
+def _repair_domain(domain: str) -> str:
+    """OCR səhvlərini düzəldir: 'gmai1.c0m' -> 'gmail.com'"""
+    labels = domain.lower().split(".")
+    # TLD-də rəqəm ola bilməz
+    labels[-1] = labels[-1].translate(_OCR_CONFUSIONS)
+    repaired = ".".join(labels)
+    if repaired in KNOWN_DOMAINS:
+        return repaired
+    candidate = repaired.translate(_OCR_CONFUSIONS).replace("rn", "m")
+    if candidate in KNOWN_DOMAINS:
+        return candidate
+    return repaired
+
+
+def is_valid_email(email: str) -> bool:
+    """Email ünvanının sintaktik yoxlanışı"""
+    if not email or email.count("@") != 1 or len(email) > 254:
+        return False
+    local, domain = email.split("@")
+    if not local or len(local) > 64 or local.startswith(".") or local.endswith(".") or ".." in local:
+        return False
+    labels = domain.split(".")
+    if len(labels) < 2 or not labels[-1].isalpha() or len(labels[-1]) < 2:
+        return False
+    return all(label and not label.startswith("-") and not label.endswith("-") for label in labels)
+
+
+def _score_email(email: str, position: int, text_length: int, repaired: bool, occurrences: int) -> float:
+    local, domain = email.split("@")
+    score = 1.0
+    if domain in KNOWN_DOMAINS:
+        score += 1.0
+    if domain in _PLACEHOLDER_DOMAINS or local in {"name", "email", "your.name", "yourname"}:
+        score -= 2.0
+    if repaired:
+        score -= 0.3
+    # Əlaqə məlumatı adətən CV-nin əvvəlində olur
+    score += 0.5 * (1 - position / max(text_length, 1))
+    score += 0.2 * min(occurrences - 1, 3)
+    return score
+
+
+def _extract_emails(text: str) -> List[Dict]:
+    candidates = {}
+    normalized = _normalize_ocr(text)
+    for source, was_normalized in ((text, False), (normalized, True)):
+        for match in _EMAIL_PATTERN.finditer(source):
+            raw = match.group(0).rstrip(".")
+            local, domain = raw.split("@", 1)
+            fixed_domain = _repair_domain(domain)
+            email = f"{local}@{fixed_domain}".lower()
+            if not is_valid_email(email):
+                continue
+            repaired = was_normalized or fixed_domain != domain.lower()
+            entry = candidates.setdefault(email, {
+                "email": email,
+                "position": match.start(),
+                "repaired": repaired,
+                "occurrences": 0
+            })
+            entry["repaired"] = entry["repaired"] and repaired
+            if not was_normalized or entry["occurrences"] == 0:
+                entry["occurrences"] += 1
+
+    for entry in candidates.values():
+        entry["score"] = _score_email(
+            entry["email"], entry["position"], len(text), entry["repaired"], entry["occurrences"]
+        )
+    return sorted(candidates.values(), key=lambda e: e["score"], reverse=True)
+
+
+def _looks_like_phone(raw: str) -> bool:
+    """Tarix aralıqlarını (2019-2021, 03.2018 - 06.2020), il/versiya
+    siyahılarını və formatsız ID nömrələrini telefondan ayırır."""
+    parts = [part.strip("()") for part in re.split(r"[ \t-]+", raw) if part.strip("()")]
+    if all(_NOT_PHONE_PART.fullmatch(part) for part in parts):
+        return False
+    # Ayırıcısız rəqəm sırası yalnız yerli (0...) və ya 994 prefiksi ilə telefon sayılır
+    if raw.isdigit() and not raw.startswith(("0", "994")):
+        return False
+    return True
+
+
+def _extract_phones(text: str) -> List[str]:
+    phones = []
+    for match in _PHONE_PATTERN.finditer(text):
+        raw = match.group(1)
+        digits = re.sub(r"\D", "", raw)
+        if not 9 <= len(digits) <= 15 or not _looks_like_phone(raw.strip()):
+            continue
+        phone = ("+" if raw.lstrip().startswith("+") else "") + digits
+        if phone not in phones:
+            phones.append(phone)
+    return phones
+
+
+def _extract_urls(pattern: re.Pattern, text: str) -> List[str]:
+    urls = []
+    for match in pattern.finditer(text):
+        url = match.group(0).rstrip("/")
+        if not url.lower().startswith("http"):
+            url = "https://" + url
+        if url.lower() not in [u.lower() for u in urls]:
+            urls.append(url)
+    return urls
+
+
+def extract_contacts(text: str, ambiguity_margin: float = 0.25) -> Dict:
+    """CV mətnindən email, telefon, LinkedIn və GitHub məlumatlarını bir keçiddə çıxarır.
+
+    Nəticədə `email` ən inandırıcı namizəddir; iki namizədin balı bir-birinə
+    çox yaxındırsa `ambiguous` True olur.
+    """
+    text = text or ""
+    emails = _extract_emails(text)
+    github = [
+        url for url in _extract_urls(_GITHUB_PATTERN, text)
+        if url.rstrip("/").split("/")[3].lower() not in _GITHUB_RESERVED
+    ]
+
+    best: Optional[str] = emails[0]["email"] if emails else None
+    ambiguous = len(emails) > 1 and emails[0]["score"] - emails[1]["score"] < ambiguity_margin
+
+    return {
+        "email": best,
+        "emails": [e["email"] for e in emails],
+        "ambiguous": ambiguous,
+        "phones": _extract_phones(text),
+        "linkedin": _extract_urls(_LINKEDIN_PATTERN, text),
+        "github": github
+    }
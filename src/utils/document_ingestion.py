@@ -0,0 +1,153 @@
+import streamlit as st
+import io
+import logging
+import os
+import zipfile
+from typing import Callable, Optional
+from docx import Document
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from src.utils.pdf_processor import PDFProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentIngestor:
+    """Fayl növünə görə CV mətnini çıxarır.
+
+    PDF faylları PDFProcessor-dan keçir, DOCX və TXT isə OCR-siz birbaşa
+    oxunur. Bütün hallarda nəticə eyni formatlı düz mətndir.
+    """
+
+    SUPPORTED_TYPES = ["pdf", "docx", "txt"]
+
+    def __init__(self, pdf_processor: Optional[PDFProcessor] = None):
+        self.pdf_processor = pdf_processor or PDFProcessor()
+
+    @staticmethod
+    def _read_bytes(file) -> bytes:
+        if hasattr(file, "getvalue"):
+            return file.getvalue()
+        data = file.read()
+        file.seek(0)
+        return data
+
+    def detect_type(self, file) -> Optional[str]:
+        """Faylın növünü uzantıya, uzantı yoxdursa məzmuna görə təyin edir"""
+        name = getattr(file, "name", "") or ""
+        extension = os.path.splitext(name)[1].lower().lstrip(".")
+        if extension in self.SUPPORTED_TYPES:
+            return extension
+
+        data = self._read_bytes(file)
+        if data[:1024].lstrip().startswith(b"%PDF-"):
+            return "pdf"
+        if data[:2] == b"PK":
+            try:
+                with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                    if "word/document.xml" in archive.namelist():
+                        return "docx"
+            except zipfile.BadZipFile:
+                return None
+        try:
+            data.decode("utf-8")
+            return "txt"
+        except UnicodeDecodeError:
+            return None
+
+    def extract_text(self, file, on_page: Optional[Callable[[int, int], None]] = None) -> Optional[str]:
+        """Faylın növündən asılı olmayaraq CV mətnini qaytarır"""
+        file_type = self.detect_type(file)
+        if file_type == "pdf":
+            return self.pdf_processor.extract_text(file, on_page=on_page)
+
+        try:
+            data = self._read_bytes(file)
+            if file_type == "docx":
+                text = self._extract_docx(data)
+            elif file_type == "txt":
+                text = self._extract_txt(data)
+            else:
+                st.error("Dəstəklənməyən fayl növü. PDF, DOCX və ya TXT yükləyin.")
+                return None
+
+            if on_page:
+                on_page(1, 1)
+            return text.strip()
+
+        except Exception as e:
+            logger.error(f"Document ingestion error: {str(e)}")
+            st.error(f"Fayl emalı zamanı xəta: {str(e)}")
+            return None
+
+    def get_preview(self, file):
+        """Önizləmə yalnız PDF faylları üçün mövcuddur"""
+        if self.detect_type(file) != "pdf":
+            return None
+        return self.pdf_processor.get_pdf_preview(file)
+
+    @staticmethod
+    def _table_text(table: Table) -> str:
+        rows = []
+        for row in table.rows:
+            cells = []
+            for cell in row.cells:
+                # Birləşdirilmiş xanalar python-docx-də təkrar qaytarılır
+                text = cell.text.strip()
+                if text and (not cells or cells[-1] != text):
+                    cells.append(text)
+            if cells:
+                rows.append(" | ".join(cells))
+        return "\n".join(rows)
+
+    def _block_text(self, container, parent) -> list:
+        """Abzas və cədvəlləri sənəddəki sırası ilə oxuyur"""
+        blocks = []
+        for child in container.iterchildren():
+            if child.tag == qn("w:p"):
+                text = Paragraph(child, parent).text.strip()
+            elif child.tag == qn("w:tbl"):
+                text = self._table_text(Table(child, parent))
+            else:
+                continue
+            if text:
+                blocks.append(text)
+        return blocks
+
+    def _extract_docx(self, data: bytes) -> str:
+        document = Document(io.BytesIO(data))
+        blocks = []
+        seen_headers = set()
+
+        # Başlıqlar (header) adətən ad və əlaqə məlumatlarını saxlayır
+        for section in document.sections:
+            header = section.header
+            if header.is_linked_to_previous:
+                continue
+            for text in self._block_text(header._element, header):
+                if text not in seen_headers:
+                    seen_headers.add(text)
+                    blocks.append(text)
+
+        blocks.extend(self._block_text(document.element.body, document))
+
+        for section in document.sections:
+            footer = section.footer
+            if footer.is_linked_to_previous:
+                continue
+            for text in self._block_text(footer._element, footer):
+                if text not in seen_headers:
+                    seen_headers.add(text)
+                    blocks.append(text)
+
+        return "\n".join(blocks)
+
+    @staticmethod
+    def _extract_txt(data: bytes) -> str:
+        for encoding in ("utf-8-sig", "cp1254"):
+            try:
+                return data.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        return data.decode("latin-1")
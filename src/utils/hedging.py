@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Sinxron (requests) sorğuların dublikatları üçün ümumi hovuz
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hedge")
+
+
+async def hedged(call: Callable[[], Awaitable[T]], delay: Optional[float],
+                 allow_hedge: Optional[Callable[[], bool]] = None) -> T:
+    """Sorğu delay saniyədə bitmədikdə dublikatını göndərir və ilk uğurlu cavabı qaytarır.
+
+    Yalnız idempotent sorğular üçün istifadə edilməlidir. delay None olduqda
+    və ya allow_hedge False qaytardıqda sorğu adi qaydada gözlənilir.
+    Hər iki cəhd uğursuz olarsa sonuncu xəta qaldırılır.
+    """
+    if delay is None:
+        return await call()
+
+    pending = {asyncio.ensure_future(call())}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return done.pop().result()
+
+        if allow_hedge is None or allow_hedge():
+            logger.info(f"Request exceeded {delay}s, sending hedged duplicate")
+            pending.add(asyncio.ensure_future(call()))
+
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        # Uduzan sorğu ləğv edilir ki, bağlantını boş yerə tutmasın
+        for task in pending:
+            task.cancel()
+
+
+def hedged_sync(call: Callable[[], T], delay: Optional[float]) -> T:
+    """hedged-in bloklayan (requests) sorğular üçün variantı.
+
+    Thread-ləri ləğv etmək mümkün olmadığından uduzan sorğu öz timeout-u
+    bitənə qədər fonda işləyir; nəticəsi atılır.
+    """
+    if delay is None:
+        return call()
+
+    futures = {_executor.submit(call)}
+    done, futures = wait(futures, timeout=delay)
+    if done:
+        return done.pop().result()
+
+    logger.info(f"Request exceeded {delay}s, sending hedged duplicate")
+    futures.add(_executor.submit(call))
+
+    error = None
+    while futures:
+        done, futures = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
@@ -0,0 +1,109 @@
+import numpy as np
+from PIL import Image
+
+
+def to_grayscale(image: Image.Image) -> np.ndarray:
+    """Şəkli float32 boz tonlu massivə çevirir (ITU-R BT.601 çəkiləri)"""
+    arr = np.asarray(image)
+    if arr.ndim == 2:
+        return arr.astype(np.float32)
+    rgb = arr[..., :3].astype(np.float32)
+    return rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def binarize_adaptive(gray: np.ndarray, window: int = 31, threshold: float = 0.15) -> np.ndarray:
+    """Bradley-Roth adaptiv binarizasiya.
+
+    Hər pikselin ətrafındakı pəncərənin ortalaması inteqral şəkil ilə
+    hesablanır. Nəticə uint8 massivdir: 0 mürəkkəb, 255 fon.
+    """
+    height, width = gray.shape
+    half = window // 2
+    span = 2 * half + 1
+
+    # İnteqral uint32-dədir: cəm daşsa da pəncərə cəmi (fərqlər) modul 2^32
+    # hesabında dəqiq qalır və bayt/piksel float64-ün yarısıdır
+    integral = np.zeros((height + 1, width + 1), dtype=np.uint32)
+    np.cumsum(np.rint(gray).astype(np.uint32), axis=0, out=integral[1:, 1:])
+    np.cumsum(integral[1:, 1:], axis=1, out=integral[1:, 1:])
+
+    # Kənarları təkrarlanmış inteqral pəncərəni sərhəddə kəsməyə bərabərdir,
+    # ona görə bütün künclər indeks massivləri əvəzinə dilimlərlə (view) alınır
+    integral = np.pad(integral, half, mode="edge")
+    window_sum = integral[span:, span:] - integral[:-span, span:]
+    window_sum -= integral[span:, :-span]
+    window_sum += integral[:-span, :-span]
+    del integral
+
+    rows = np.arange(height)
+    cols = np.arange(width)
+    row_count = (np.minimum(rows + half + 1, height) - np.maximum(rows - half, 0)).astype(np.float32)
+    col_count = (np.minimum(cols + half + 1, width) - np.maximum(cols - half, 0)).astype(np.float32)
+
+    # gray * area < sum * (1 - t) bərabərsizliyi pəncərə ortalaması ilə
+    limit = window_sum.astype(np.float32)
+    del window_sum
+    limit /= row_count[:, None]
+    limit /= col_count[None, :]
+    limit *= 1.0 - threshold
+
+    ink = gray < limit
+    del limit
+    return np.where(ink, 0, 255).astype(np.uint8)
+
+
+def estimate_skew(binary: np.ndarray, max_angle: float = 5.0, step: float = 0.5) -> float:
+    """Proyeksiya profili üsulu ilə mətnin əyilmə bucağını (dərəcə) tapır"""
+    image = Image.fromarray(binary)
+    # Sürət üçün kiçildilmiş şəkil üzərində hesablanır
+    scale = min(1.0, 800 / max(image.size))
+    if scale < 1.0:
+        image = image.resize((int(image.width * scale), int(image.height * scale)), Image.NEAREST)
+
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-max_angle, max_angle + step / 2, step):
+        rotated = np.asarray(image.rotate(float(angle), resample=Image.NEAREST, fillcolor=255))
+        # Düz sətirlərdə sətir cəmlərinin dispersiyası maksimum olur
+        profile = (rotated < 128).sum(axis=1, dtype=np.float64)
+        score = float(np.var(profile))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def crop_whitespace(binary: np.ndarray, margin: int = 10) -> np.ndarray:
+    """Mətnin ətrafındakı boş sahəni kəsir"""
+    ink = binary < 128
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if rows.size == 0 or cols.size == 0:
+        return binary
+
+    top = max(rows[0] - margin, 0)
+    bottom = min(rows[-1] + margin + 1, binary.shape[0])
+    left = max(cols[0] - margin, 0)
+    right = min(cols[-1] + margin + 1, binary.shape[1])
+    return binary[top:bottom, left:right]
+
+
+def preprocess_page(image: Image.Image, grayscale: bool = True, binarize: bool = True,
+                    deskew: bool = False, crop: bool = True) -> Image.Image:
+    """Səhifə şəklini OCR üçün hazırlayır"""
+    if not grayscale:
+        return image
+
+    arr = to_grayscale(image)
+    if binarize:
+        arr = binarize_adaptive(arr)
+    else:
+        arr = arr.clip(0, 255).astype(np.uint8)
+
+    if deskew:
+        angle = estimate_skew(arr if binarize else binarize_adaptive(arr.astype(np.float32)))
+        if angle:
+            arr = np.asarray(Image.fromarray(arr).rotate(angle, resample=Image.BILINEAR, fillcolor=255))
+
+    if crop:
+        arr = crop_whitespace(arr)
+
+    return Image.fromarray(arr)
@@ -0,0 +1,196 @@
+import json
+import re
+from typing import Dict, Tuple
+
+_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_SMART_QUOTES = "“”„"
+
+
+def _extract_object(text: str) -> Tuple[str, bool]:
+    """Mətndəki ilk JSON obyektini ({...}) və onun kəsilib-kəsilmədiyini qaytarır"""
+    start = text.find("{")
+    if start == -1:
+        raise ValueError("JSON obyekti tapılmadı")
+
+    depth = 0
+    in_string = False
+    escape = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1], False
+
+    # Kəsilmiş cavab: açıq qalan sətir və mötərizələri bağla
+    tail = text[start:]
+    if in_string:
+        tail += '"'
+    return tail + "}" * depth, True
+
+
+def _repair(candidate: str) -> str:
+    """Sətir literallarından kənarda "ağıllı" dırnaqları və sondakı vergülləri düzəldir.
+
+    Sətir vəziyyəti _extract_object-dəki kimi izlənir, ona görə dəyərlərin
+    içindəki “Python” və ya "x, ]" kimi mətnə toxunulmur.
+    """
+    result = []
+    quote = None
+    escape = False
+    pending_comma = None
+    for char in candidate:
+        if quote is not None:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"' or (quote != '"' and char in _SMART_QUOTES):
+                # Ağıllı dırnaqla açılan sətir həm ağıllı, həm adi dırnaqla bağlana bilər
+                quote = None
+                char = '"'
+            result.append(char)
+            continue
+
+        if char == '"' or char in _SMART_QUOTES:
+            quote = char
+            char = '"'
+        elif char in "}]" and pending_comma is not None:
+            # Bağlayan mötərizədən əvvəlki vergül atılır
+            del result[pending_comma]
+        if char == ",":
+            pending_comma = len(result)
+        elif not char.isspace():
+            pending_comma = None
+        result.append(char)
+    return "".join(result)
+
+
+def parse_json_checked(text: str) -> Tuple[Dict, bool]:
+    """LLM cavabını JSON obyektinə çevirir.
+
+    Markdown bloklarını (```json), obyektdən əvvəl/sonra gələn mətni,
+    "ağıllı" dırnaqları, sonda qalan vergülləri və kəsilmiş cavabı düzəldir.
+    Düzəlişlər yalnız çıxarılmış obyekt olduğu kimi oxunmadıqda və yalnız
+    sətir literallarından kənarda tətbiq olunur. İkinci dəyər cavabın
+    kəsildiyini (bağlanmamış obyektin tamamlandığını) bildirir.
+    """
+    text = (text or "").strip()
+    try:
+        result = json.loads(text)
+        if isinstance(result, dict):
+            return result, False
+    except json.JSONDecodeError:
+        pass
+
+    fenced = _FENCE_PATTERN.search(text)
+    if fenced:
+        text = fenced.group(1)
+
+    candidate, truncated = _extract_object(text)
+    try:
+        result = json.loads(candidate, strict=False)
+    except json.JSONDecodeError:
+        try:
+            result = json.loads(_repair(candidate), strict=False)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON cavabı bərpa oluna bilmədi: {str(e)}")
+    if not isinstance(result, dict):
+        raise ValueError("JSON cavabı obyekt deyil")
+    return result, truncated
+
+
+def parse_json_lenient(text: str) -> Dict:
+    """parse_json_checked kimi, yalnız obyekti qaytarır"""
+    return parse_json_checked(text)[0]
+
+
+class StreamingJSONParser:
+    """Axınla gələn JSON obyektinin yuxarı səviyyəli sahələrini tamamlandıqca qaytarır.
+
+    Hər `feed` çağırışı yalnız yeni tamamlanmış sahələri qaytarır. Obyektdən
+    əvvəl gələn mətn (məsələn, markdown bloku) nəzərə alınmır.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields = {}
+        self._index = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+
+    def _emit(self, end: int, completed: Dict):
+        if self._key is None or self._value_start is None:
+            return
+        raw = self.buffer[self._value_start:end].strip()
+        try:
+            value = json.loads(raw, strict=False)
+        except json.JSONDecodeError:
+            value = None
+        if value is not None:
+            self.fields[self._key] = value
+            completed[self._key] = value
+        self._key = None
+        self._value_start = None
+
+    def feed(self, chunk: str) -> Dict:
+        self.buffer += chunk
+        completed = {}
+        while self._index < len(self.buffer):
+            index = self._index
+            char = self.buffer[index]
+            self._index += 1
+
+            if self._depth == 0:
+                # Obyekt başlamamış gələn mətn nəzərə alınmır
+                if char == "{":
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(self.buffer[self._key_start:index + 1], strict=False)
+                        self._key_start = None
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = index
+                    self._expect_key = False
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 1:
+                    self._emit(index, completed)
+                self._depth -= 1
+            elif self._depth == 1:
+                if char == ":":
+                    self._value_start = index + 1
+                elif char == ",":
+                    self._emit(index, completed)
+                    self._expect_key = True
+        return completed
@@ -0,0 +1,80 @@
+import logging
+import os
+import subprocess
+import tempfile
+from typing import List
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class TesseractBatchBackend:
+    """Bir neçə səhifə şəklini tək tesseract çağırışında OCR edir.
+
+    Şəkillər müvəqqəti qovluğa yazılır və tesseract-a siyahı faylı kimi
+    verilir, beləliklə proses başlanğıcı və traineddata yüklənməsi hər
+    səhifə üçün deyil, hər paket üçün bir dəfə baş verir.
+
+    Səhifələr mətndə rast gəlinməyən ayırıcı ilə (page_separator) bölünür.
+    Tesseract versiyasından asılı olaraq ayırıcı səhifələr arasında və ya
+    hər səhifədən sonra yazılır; hansı olduğu ayırıcı sayından bilinir.
+    Say heç birinə uyğun gəlmirsə paket səhifə-səhifə yenidən OCR edilir.
+    """
+
+    PAGE_SEPARATOR = "<<<ocr-page-break-7c1e>>>"
+
+    def __init__(self, tesseract_cmd: str, lang: str = "eng", psm: int = 3, timeout: int = 120):
+        self.tesseract_cmd = tesseract_cmd
+        self.lang = lang
+        self.psm = psm
+        self.timeout = timeout
+
+    def _run(self, images: List[Image.Image]) -> str:
+        with tempfile.TemporaryDirectory(prefix="ocr_batch_") as tmp_dir:
+            paths = []
+            for index, image in enumerate(images):
+                path = os.path.join(tmp_dir, f"page_{index:04d}.png")
+                # Sıxılma OCR üçün əhəmiyyətsizdir, sürət üçün minimal saxlanılır
+                image.save(path, format="PNG", compress_level=1)
+                paths.append(path)
+
+            list_file = os.path.join(tmp_dir, "pages.txt")
+            with open(list_file, "w", encoding="utf-8") as f:
+                f.write("\n".join(paths) + "\n")
+
+            result = subprocess.run(
+                [
+                    self.tesseract_cmd, list_file, "stdout",
+                    "-l", self.lang,
+                    "--psm", str(self.psm),
+                    "-c", f"page_separator={self.PAGE_SEPARATOR}"
+                ],
+                capture_output=True,
+                timeout=self.timeout
+            )
+
+        if result.returncode != 0:
+            raise RuntimeError(f"Tesseract xətası: {result.stderr.decode('utf-8', errors='ignore').strip()}")
+        return result.stdout.decode("utf-8", errors="ignore")
+
+    def ocr_batch(self, images: List[Image.Image]) -> List[str]:
+        """Şəkilləri OCR edir və hər şəkil üçün ayrıca mətn qaytarır"""
+        if not images:
+            return []
+
+        output = self._run(images)
+        separators = output.count(self.PAGE_SEPARATOR)
+        pages = output.split(self.PAGE_SEPARATOR)
+        if separators == len(images):
+            # Ayırıcı hər səhifədən sonra yazılıb: sonuncu hissə boşdur
+            pages.pop()
+        elif separators != len(images) - 1:
+            if len(images) == 1:
+                return ["\n".join(pages).replace("\f", "")]
+            logger.warning(
+                f"Tesseract returned {separators} separators for {len(images)} pages, falling back to per-page OCR"
+            )
+            return [self.ocr_batch([image])[0] for image in images]
+        # \f səhifə ayırıcısı kimi keşdə istifadə olunur, mətndə qalmamalıdır
+        return [page.replace("\f", "") for page in pages]
@@ -1,40 +1,344 @@
 import streamlit as st
-from typing import Optional
+from typing import Callable, Iterator, Optional, Tuple
 import tempfile
 import os
-import pytesseract
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_bytes, pdfinfo_from_bytes
 from PIL import Image
 import io
+import logging
+import hashlib
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from src.config.settings import (
+    CACHE_DIR,
+    MAX_PDF_BYTES,
+    MAX_PDF_PAGES,
+    OCR_DPI,
+    OCR_LANG,
+    OCR_PAGE_WINDOW,
+    OCR_PRESET,
+    OCR_PRESETS,
+    OCR_WORKERS,
+    POPPLER_PATH,
+    TEXT_CACHE_MAX_BYTES,
+    TEXT_LAYER_MIN_CHARS,
+    TEXT_LAYER_MIN_QUALITY,
+    TESSERACT_CMD,
+)
+from src.utils.cache import DiskCache
+from src.utils.image_preprocessing import preprocess_page
+from src.utils.ocr_backend import TesseractBatchBackend
+
+logger = logging.getLogger(__name__)
+
+# Bütün PDFProcessor obyektləri və proseslər eyni keş qovluğunu paylaşır
+text_cache = DiskCache(os.path.join(CACHE_DIR, "resume_text"), TEXT_CACHE_MAX_BYTES)
+
+
+class PDFDocument:
+    """Bir PDF faylı üçün render olunmuş səhifələri saxlayır.
+
+    Doğrulama, önizləmə və OCR eyni obyektdən istifadə edir, ona görə hər
+    səhifə yalnız bir dəfə rasterləşdirilir.
+    """
+
+    def __init__(self, pdf_bytes: bytes, dpi: int, poppler_path: Optional[str] = None):
+        self.pdf_bytes = pdf_bytes
+        self.sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+        self.dpi = dpi
+        self.poppler_path = poppler_path
+        self._info = None
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    @property
+    def info(self) -> dict:
+        """pdfinfo nəticəsi (render etmədən)"""
+        if self._info is None:
+            self._info = pdfinfo_from_bytes(self.pdf_bytes, poppler_path=self.poppler_path)
+        return self._info
+
+    @property
+    def page_count(self) -> int:
+        return int(self.info.get("Pages", 0))
+
+    def render(self, page_numbers: list) -> list:
+        """Göstərilən səhifələri (1-dən başlayan) qaytarır, lazım olanları render edir"""
+        with self._lock:
+            missing = [n for n in page_numbers if n not in self._pages]
+            start = 0
+            while start < len(missing):
+                # Ardıcıl səhifələri bir pdftoppm çağırışında render et
+                end = start
+                while end + 1 < len(missing) and missing[end + 1] == missing[end] + 1:
+                    end += 1
+                images = convert_from_bytes(
+                    self.pdf_bytes,
+                    first_page=missing[start],
+                    last_page=missing[end],
+                    dpi=self.dpi,
+                    poppler_path=self.poppler_path
+                )
+                expected = missing[end] - missing[start] + 1
+                if len(images) != expected:
+                    # zip qısa nəticəni səssizcə kəsər və mətn səhv səhifələrə yazılardı
+                    raise RuntimeError(
+                        f"pdftoppm {missing[start]}-{missing[end]} səhifələri üçün "
+                        f"{expected} əvəzinə {len(images)} şəkil qaytardı"
+                    )
+                for page_no, image in zip(range(missing[start], missing[end] + 1), images):
+                    self._pages[page_no] = image
+                start = end + 1
+            return [self._pages[n] for n in page_numbers]
+
+    def discard(self, page_numbers: list, keep_first: bool = True):
+        """Render olunmuş səhifələri yaddaşdan azad edir"""
+        with self._lock:
+            for page_no in page_numbers:
+                # İlk səhifə önizləmə üçün saxlanılır
+                if keep_first and page_no == 1:
+                    continue
+                self._pages.pop(page_no, None)
+
 
 class PDFProcessor:
-    def __init__(self):
+    MAX_OPEN_DOCUMENTS = 4
+    MAX_PREVIEWS = 32
+
+    # Streamlit hər rerun-da yeni PDFProcessor yaradır, ona görə sənədlər və
+    # önizləmələr modul səviyyəsində (proses boyu) saxlanılır
+    _documents = OrderedDict()
+    _previews = OrderedDict()
+    _registry_lock = threading.Lock()
+
+    def __init__(self, ocr_workers: int = OCR_WORKERS, ocr_lang: str = OCR_LANG,
+                 ocr_dpi: Optional[int] = OCR_DPI, preset: str = OCR_PRESET,
+                 tesseract_cmd: str = TESSERACT_CMD):
        
-        pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+        if preset not in OCR_PRESETS:
+            raise ValueError(f"Naməlum OCR preseti: {preset}")
+        self.preset = preset
+        self.preset_options = OCR_PRESETS[preset]
+        self.ocr_workers = max(1, ocr_workers)
+        self.ocr_lang = ocr_lang
+        self.ocr_dpi = ocr_dpi or self.preset_options["dpi"]
+        self.poppler_path = POPPLER_PATH
+        self.cache = text_cache
+        self.ocr_backend = TesseractBatchBackend(
+            tesseract_cmd,
+            lang=self.ocr_lang,
+            psm=self.preset_options["psm"]
+        )
+        # OCR işçiləri prosessor ömrü boyu saxlanılır, hər faylda yenidən yaradılmır
+        self._executor = None
+        self._executor_lock = threading.Lock()
 
-    def extract_text(self, pdf_file) -> Optional[str]:
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.ocr_workers, thread_name_prefix="ocr")
+            return self._executor
+
+    def close(self):
+        """OCR işçilərini dayandırır"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _cache_key(self, pdf_bytes: bytes) -> str:
+        return DiskCache.make_key(
+            pdf_bytes,
+            lang=self.ocr_lang,
+            dpi=self.ocr_dpi,
+            preset=self.preset_options,
+            engine="pdftotext+tesseract",
+            text_layer=(TEXT_LAYER_MIN_CHARS, TEXT_LAYER_MIN_QUALITY)
+        )
+
+    def _extract_text_layer(self, pdf_bytes: bytes) -> list:
+        """PDF-in daxili mətn qatını poppler (pdftotext) ilə səhifə-səhifə oxuyur"""
+        pdftotext = os.path.join(self.poppler_path, "pdftotext") if self.poppler_path else "pdftotext"
         try:
-            images = convert_from_bytes(pdf_file.read())
-            
-            text = ""
-            for image in images:
-             
-                text += pytesseract.image_to_string(image, lang='eng') + "\n"
-            
-            return text.strip()
+            result = subprocess.run(
+                [pdftotext, "-layout", "-enc", "UTF-8", "-", "-"],
+                input=pdf_bytes,
+                capture_output=True,
+                timeout=30,
+                check=True
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Text layer extraction failed, falling back to OCR: {str(e)}")
+            return []
+
+        # pdftotext hər səhifədən sonra form feed (\f) yazır
+        output = result.stdout.decode("utf-8", errors="ignore")
+        pages = output.split("\f")
+        if output.endswith("\f"):
+            pages.pop()
+        return pages
+
+    @staticmethod
+    def _is_usable_text(text: str) -> bool:
+        """Mətn qatının OCR-siz istifadə oluna biləcəyini yoxlayır"""
+        content = "".join(text.split())
+        if len(content) < TEXT_LAYER_MIN_CHARS:
+            return False
+
+        # Zədəli font kodlaşdırması adətən oxunmaz simvollar verir
+        readable = sum(1 for c in content if c.isalnum() or c in ".,;:!?@()[]-+/&%'\"#*|")
+        return readable / len(content) >= TEXT_LAYER_MIN_QUALITY
+
+    @staticmethod
+    def _read_bytes(pdf_file) -> bytes:
+        if hasattr(pdf_file, "getvalue"):
+            return pdf_file.getvalue()
+        data = pdf_file.read()
+        pdf_file.seek(0)
+        return data
+
+    def open_document(self, pdf_file) -> PDFDocument:
+        """Fayl üçün paylaşılan PDFDocument obyektini qaytarır"""
+        pdf_bytes = self._read_bytes(pdf_file)
+        sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+        key = (sha256, self.ocr_dpi)
+
+        with self._registry_lock:
+            document = self._documents.get(key)
+            if document is None:
+                document = PDFDocument(pdf_bytes, self.ocr_dpi, self.poppler_path)
+                self._documents[key] = document
+                while len(self._documents) > self.MAX_OPEN_DOCUMENTS:
+                    self._documents.popitem(last=False)
+            else:
+                self._documents.move_to_end(key)
+            return document
+
+    def _preprocess(self, image):
+        options = self.preset_options
+        return preprocess_page(
+            image,
+            grayscale=options["grayscale"],
+            binarize=options["binarize"],
+            deskew=options["deskew"],
+            crop=options["crop"]
+        )
+
+    def _ocr_batch(self, images) -> list:
+        return self.ocr_backend.ocr_batch([self._preprocess(image) for image in images])
+
+    def _ocr_pages(self, images) -> list:
+        """Səhifələri OCR edir, nəticələri səhifə sırası ilə qaytarır"""
+        workers = min(self.ocr_workers, len(images))
+        if workers <= 1:
+            return self._ocr_batch(images)
+
+        # Səhifələr işçilər arasında ardıcıl paketlərə bölünür: hər paket bir
+        # tesseract prosesidir, paketlər isə paralel işləyir
+        size, extra = divmod(len(images), workers)
+        batches = []
+        start = 0
+        for i in range(workers):
+            end = start + size + (1 if i < extra else 0)
+            batches.append(images[start:end])
+            start = end
+
+        executor = self._get_executor()
+        return [text for batch in executor.map(self._ocr_batch, batches) for text in batch]
+
+    def _check_limits(self, document: PDFDocument):
+        """Rasterləşdirmədən əvvəl səhifə sayı limitini yoxlayır"""
+        if document.page_count > MAX_PDF_PAGES:
+            raise ValueError(
+                f"PDF-də səhifə sayı çoxdur ({document.page_count}, limit {MAX_PDF_PAGES})"
+            )
+
+    def iter_pages(self, pdf_file) -> Iterator[Tuple[int, str]]:
+        """Səhifələri kiçik pəncərələrlə emal edir və (səhifə nömrəsi, mətn) qaytarır.
+
+        Eyni anda yaddaşda ən çox OCR_PAGE_WINDOW render olunmuş səhifə olur.
+        """
+        pdf_bytes = self._read_bytes(pdf_file)
+        if len(pdf_bytes) > MAX_PDF_BYTES:
+            raise ValueError(
+                f"PDF faylı çox böyükdür ({len(pdf_bytes) // 1024} KB, limit {MAX_PDF_BYTES // 1024} KB)"
+            )
+        document = self.open_document(pdf_file)
+
+        cache_key = self._cache_key(document.pdf_bytes)
+        cached_text = self.cache.get(cache_key)
+        if cached_text is not None:
+            logger.info(f"Resume text cache hit: {self.cache.stats()}")
+            for page_no, page_text in enumerate(cached_text.split("\f"), start=1):
+                yield page_no, page_text
+            return
+
+        self._check_limits(document)
+        page_count = document.page_count
+        text_layer = self._extract_text_layer(document.pdf_bytes)
+        if len(text_layer) != page_count:
+            # Mətn qatı yoxdursa bütün səhifələr OCR edilir
+            text_layer = [""] * page_count
+
+        pages = []
+        ocr_count = 0
+        for window_start in range(1, page_count + 1, OCR_PAGE_WINDOW):
+            window = list(range(window_start, min(window_start + OCR_PAGE_WINDOW, page_count + 1)))
+            window_text = {n: text_layer[n - 1] for n in window}
+
+            # Yalnız mətn qatı boş və ya keyfiyyətsiz olan səhifələri OCR et
+            ocr_pages = [n for n in window if not self._is_usable_text(window_text[n])]
+            if ocr_pages:
+                images = document.render(ocr_pages)
+                texts = self._ocr_pages(images)
+                if len(images) != len(ocr_pages) or len(texts) != len(ocr_pages):
+                    raise RuntimeError(
+                        f"OCR {len(ocr_pages)} səhifə əvəzinə {len(images)} şəkil, {len(texts)} mətn qaytardı"
+                    )
+                for page_no, page_text in zip(ocr_pages, texts):
+                    window_text[page_no] = page_text
+                del images
+                document.discard(ocr_pages)
+                ocr_count += len(ocr_pages)
+
+            for page_no in window:
+                pages.append(window_text[page_no])
+                yield page_no, window_text[page_no]
+
+        logger.info(f"Text layer used for {page_count - ocr_count}/{page_count} pages")
+        if any(page.strip() for page in pages):
+            self.cache.set(cache_key, "\f".join(pages))
+
+    def extract_text(self, pdf_file, on_page: Optional[Callable[[int, int], None]] = None) -> Optional[str]:
+        try:
+            pages = []
+            document = None
+            for page_no, page_text in self.iter_pages(pdf_file):
+                if on_page:
+                    document = document or self.open_document(pdf_file)
+                    on_page(page_no, document.page_count)
+
+                pages.append(page_text.strip())
+
+            # Səhifə sərhədləri \f ilə saxlanılır (prompt_compactor təkrarlanan başlıq/altbilgini yalnız orada axtarır)
+            return "\f".join(pages).strip()
             
         except Exception as e:
             st.error(f"PDF emalı zamanı xəta: {str(e)}")
             return None
 
     def validate_pdf(self, file) -> bool:
+        """Faylın PDF olduğunu render etmədən (başlıq + pdfinfo) yoxlayır"""
         if file is None:
             return False
         try:
-            convert_from_bytes(file.read())
-            file.seek(0)  
-            return True
-        except:
+            document = self.open_document(file)
+            if b"%PDF-" not in document.pdf_bytes[:1024]:
+                return False
+            return document.page_count > 0
+        except Exception:
             return False
 
     def save_temp_pdf(self, pdf_file) -> Optional[str]:
@@ -49,20 +353,29 @@ class PDFProcessor:
     def get_pdf_preview(self, pdf_file):
         """PDF-in ilk səhifəsinin görüntüsünü qaytarır"""
         try:
-            images = convert_from_bytes(
-                pdf_file.getvalue(),
-                first_page=1,
-                last_page=1
-            )
+            document = self.open_document(pdf_file)
+            with self._registry_lock:
+                preview = self._previews.get(document.sha256)
+                if preview is not None:
+                    self._previews.move_to_end(document.sha256)
+                    return preview
+
+            # OCR ilə eyni render olunmuş səhifədən istifadə olunur
+            images = document.render([1])
             
             if images:
              
-                img = images[0]
+                img = images[0].copy()
                 img.thumbnail((800, 800))
                 
                 img_byte_arr = io.BytesIO()
                 img.save(img_byte_arr, format='PNG')
                 img_byte_arr = img_byte_arr.getvalue()
+
+                with self._registry_lock:
+                    self._previews[document.sha256] = img_byte_arr
+                    while len(self._previews) > self.MAX_PREVIEWS:
+                        self._previews.popitem(last=False)
                 
                 return img_byte_arr
                 
@@ -0,0 +1,203 @@
+import re
+from typing import Dict, List, Tuple
+
+# Bölmə başlıqları (ingilis və azərbaycan dillərində) və onların dəyəri.
+# Büdcə aşıldıqda ən aşağı dəyərli bölmələr birinci atılır.
+SECTION_KEYWORDS = {
+    "experience": ["experience", "work history", "employment", "professional experience",
+                   "work experience", "iş təcrübəsi", "təcrübə"],
+    "skills": ["skills", "technical skills", "technologies", "tech stack", "competencies",
+               "bacarıqlar", "texniki bacarıqlar"],
+    "summary": ["summary", "profile", "about me", "objective", "haqqımda", "xülasə", "profil"],
+    "projects": ["projects", "personal projects", "layihələr"],
+    "education": ["education", "academic background", "təhsil"],
+    "certifications": ["certifications", "certificates", "courses", "training",
+                       "sertifikatlar", "kurslar"],
+    "languages": ["languages", "dillər"],
+    "awards": ["awards", "achievements", "nailiyyətlər", "mükafatlar"],
+    "interests": ["interests", "hobbies", "maraqlar", "hobbilər"],
+    "references": ["references", "referanslar", "tövsiyələr"]
+}
+
+SECTION_PRIORITY = {
+    "header": 9,
+    "skills": 10,
+    "experience": 10,
+    "summary": 7,
+    "projects": 6,
+    "education": 5,
+    "certifications": 4,
+    "other": 3,
+    "awards": 3,
+    "languages": 2,
+    "interests": 1,
+    "references": 0
+}
+
+_PAGE_NUMBER_PATTERN = re.compile(
+    r"^\s*(?:-\s*)?(?:page|səhifə|səh\.?)?\s*\d{1,3}(?:\s*(?:of|/|-)\s*\d{1,3})?(?:\s*-)?\s*$",
+    re.IGNORECASE
+)
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_CONTROL_PATTERN = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Lokal token təxmini: hər söz ~4 simvolluq hissələrə, hər durğu işarəsi bir tokenə bərabər"""
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        tokens += max(1, (len(piece) + 3) // 4) if piece[0].isalnum() or piece[0] == "_" else 1
+    return tokens
+
+
+# C++, C#, F#, .NET kimi adlar simvol çox olsa da mənalıdır
+_TECH_TOKEN_PATTERN = re.compile(r"[A-Za-z]+(?:\+\+|#)|\.[A-Za-z]+\b")
+# Səhifənin əvvəlində və sonunda başlıq/altbilgi sayılan boş olmayan sətir sayı
+_PAGE_MARGIN_LINES = 3
+
+
+def _is_garbage(line: str) -> bool:
+    """OCR zibili: əsasən simvollardan ibarət sətirlər"""
+    content = _TECH_TOKEN_PATTERN.sub("x", line.replace(" ", ""))
+    if not content:
+        return False
+    alnum = sum(1 for c in content if c.isalnum())
+    return alnum / len(content) < 0.4 or (len(content) <= 2 and not content.isalnum())
+
+
+def _margin_keys(lines: List[str]) -> Dict[int, Tuple[str, int, str]]:
+    """Səhifənin əvvəlindəki və sonundakı sətirlər: indeks -> (kənar, mövqe, mətn)"""
+    filled = [
+        i for i, line in enumerate(lines)
+        if line and not _PAGE_NUMBER_PATTERN.match(line) and not _is_garbage(line)
+    ]
+    keys = {}
+    for position, i in enumerate(reversed(filled[-_PAGE_MARGIN_LINES:])):
+        keys[i] = ("bottom", position, lines[i].lower())
+    for position, i in enumerate(filled[:_PAGE_MARGIN_LINES]):
+        keys[i] = ("top", position, lines[i].lower())
+    return keys
+
+
+def normalize_text(text: str) -> str:
+    """Boşluqları normallaşdırır, səhifə nömrələrini, OCR zibilini və təkrarlanan başlıqları silir.
+
+    Səhifələr \f ilə ayrılıbsa bir neçə səhifənin əvvəlində və ya sonunda
+    eyni mövqedə təkrarlanan sətirlər (ad, əlaqə, altbilgi) bir dəfə
+    saxlanılır. Mətnin içindəki təkrarlar (eyni vəzifə adı, eyni bənd)
+    toxunulmaz qalır.
+    """
+    pages = [
+        [" ".join(line.split()) for line in _CONTROL_PATTERN.sub(" ", page).splitlines()]
+        for page in text.split("\f")
+    ]
+    margins = [_margin_keys(lines) for lines in pages] if len(pages) > 1 else [{} for _ in pages]
+
+    counts = {}
+    for page_margins in margins:
+        for key in set(page_margins.values()):
+            counts[key] = counts.get(key, 0) + 1
+
+    seen = set()
+    result = []
+    for lines, page_margins in zip(pages, margins):
+        for i, line in enumerate(lines):
+            if not line:
+                if result and result[-1]:
+                    result.append("")
+                continue
+            if _PAGE_NUMBER_PATTERN.match(line) or _is_garbage(line):
+                continue
+            key = page_margins.get(i)
+            if key is not None and counts[key] > 1:
+                if key in seen:
+                    continue
+                seen.add(key)
+            result.append(line)
+
+    return "\n".join(result).strip()
+
+
+def _heading_section(line: str):
+    candidate = line.strip().strip(":").strip().lower()
+    if not candidate or len(candidate) > 40:
+        return None
+    for section, keywords in SECTION_KEYWORDS.items():
+        if candidate in keywords:
+            return section
+    return None
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Mətni (bölmə adı, mətn) cütlərinə bölür; ilk başlıqdan əvvəlki hissə 'header' sayılır"""
+    sections = []
+    name = "header"
+    buffer = []
+    for line in text.splitlines():
+        section = _heading_section(line)
+        if section:
+            if buffer and any(buffer):
+                sections.append((name, "\n".join(buffer).strip()))
+            name = section
+            buffer = [line]
+        else:
+            buffer.append(line)
+    if buffer and any(buffer):
+        sections.append((name, "\n".join(buffer).strip()))
+    return sections
+
+
+def _truncate_to_budget(text: str, budget: int) -> str:
+    lines = text.splitlines()
+    kept = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def compact_resume(text: str, token_budget: int) -> Tuple[str, Dict]:
+    """CV mətnini normallaşdırır və token büdcəsinə sığdırır.
+
+    Normallaşdırma həmişə aparılır; bölmələr yalnız normallaşmış mətn
+    büdcəyə sığmadıqda atılır.
+    Qaytarır: (yığcam mətn, statistika). Statistikada əvvəlki və sonrakı
+    token sayı, həmçinin atılmış bölmələr olur.
+    """
+    tokens_before = estimate_tokens(text)
+    normalized = normalize_text(text)
+    if estimate_tokens(normalized) <= token_budget:
+        return normalized, {
+            "tokens_before": tokens_before,
+            "tokens_after": estimate_tokens(normalized),
+            "dropped_sections": []
+        }
+
+    sections = split_sections(normalized)
+    costs = [estimate_tokens(body) for _, body in sections]
+    kept = [True] * len(sections)
+    dropped = []
+
+    total = sum(costs)
+    order = sorted(range(len(sections)), key=lambda i: (SECTION_PRIORITY.get(sections[i][0], 3), -i))
+    for index in order:
+        if total <= token_budget or sum(kept) == 1:
+            break
+        kept[index] = False
+        total -= costs[index]
+        dropped.append(sections[index][0])
+
+    compacted = "\n\n".join(body for (_, body), keep in zip(sections, kept) if keep)
+    if estimate_tokens(compacted) > token_budget:
+        # Tək qalan bölmə də büdcədən böyükdürsə sonu kəsilir
+        compacted = _truncate_to_budget(compacted, token_budget)
+
+    return compacted, {
+        "tokens_before": tokens_before,
+        "tokens_after": estimate_tokens(compacted),
+        "dropped_sections": dropped
+    }
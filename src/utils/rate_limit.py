@@ -0,0 +1,58 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Dəqiqəlik limit üçün thread-safe token bucket.
+
+    Event loop-a bağlı deyil, ona görə müxtəlif Streamlit sessiyaları
+    (ayrı thread və loop-lar) eyni limiti paylaşa bilər.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """Lazım olan miqdarın əlçatan olmasına qədər gözləmə müddəti (saniyə)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            # Tutumdan böyük sorğu heç vaxt sığmaz, tam bucket ilə buraxılır
+            amount = min(amount, self.capacity)
+            if self._tokens >= amount:
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def consume(self, amount: float = 1.0):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= min(amount, self.capacity)
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """Uğurlu olduqda 0 qaytarır, əks halda gözləmə müddətini"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            amount = min(amount, self.capacity)
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def pause(self, seconds: float):
+        """Server Retry-After qaytardıqda bucket-i müvəqqəti dayandırır"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
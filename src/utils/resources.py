@@ -0,0 +1,191 @@
+import asyncio
+import atexit
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+import streamlit as st
+
+from src.config.settings import RESOURCE_HOLDER_TTL
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncRunner:
+    """Proses boyu işləyən fon event loop-u.
+
+    Streamlit hər rerun-da asyncio.run ilə yeni loop yaradır, loop-a bağlı
+    HTTP klientləri isə hər dəfə yenidən qurulur. Korutinlər bu loop-da
+    icra olunduqda klientlər və bağlantılar rerun-lar və sessiyalar
+    arasında təkrar istifadə olunur.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async-runner", daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Korutini fon loop-unda icra edir və nəticəni gözləyir"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def iterate(self, agen: AsyncIterator[T]) -> Iterator[T]:
+        """Async generatoru çağıran thread-də (məs. Streamlit skripti) adi generator kimi oxuyur"""
+        try:
+            while True:
+                try:
+                    yield self.run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.run(agen.aclose())
+
+    def close(self):
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(5)
+
+
+class ResourceRegistry:
+    """Klient və hovuzları (növ, etimadnamə) açarı ilə proses boyu saxlayır.
+
+    Modullar Streamlit rerun-larında yenidən import olunmadığı üçün bu
+    obyekt bütün sessiyalar arasında paylaşılır. Etimadnamələr açarda
+    yalnız hash şəklində saxlanılır.
+
+    get ilə alınan resurs prosesin sonuna qədər yaşayır. acquire ilə
+    alınan resursu istifadə edən sahiblər (sessiyalar) sayılır və resurs
+    sonuncu sahib release edəndə bağlanır. Streamlit sessiyanın bitdiyini
+    bildirmir, ona görə hər sahibin son acquire vaxtı saxlanılır və
+    holder_ttl saniyədən çox görünməyən sahiblər növbəti acquire-da
+    çıxarılır.
+    """
+
+    def __init__(self, holder_ttl: float = RESOURCE_HOLDER_TTL):
+        self._resources: Dict[Tuple[str, str], Tuple[object, Optional[Callable]]] = {}
+        # (növ, açar) -> {sahib: son görülmə vaxtı}
+        self._holders: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self.holder_ttl = holder_ttl
+        # Factory-lər başqa resursu registry-dən ala bilər, ona görə RLock
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(credentials: tuple) -> str:
+        return hashlib.sha256(repr(credentials).encode("utf-8")).hexdigest()
+
+    def get(self, kind: str, key: str, factory: Callable[[], T], closer: Optional[Callable[[T], None]] = None) -> T:
+        with self._lock:
+            entry = self._resources.get((kind, key))
+            if entry is None:
+                # Factory xəta qaldırarsa heç nə keşlənmir
+                entry = (factory(), closer)
+                self._resources[(kind, key)] = entry
+                logger.info(f"Resource created: {kind}")
+            return entry[0]
+
+    def acquire(self, kind: str, key: str, holder: str, factory: Callable[[], T],
+                closer: Optional[Callable[[T], None]] = None, now: Optional[float] = None) -> T:
+        now = time.time() if now is None else now
+        with self._lock:
+            resource = self.get(kind, key, factory, closer)
+            self._holders.setdefault((kind, key), {})[holder] = now
+            stale = self._sweep(now)
+        for stale_kind, entry in stale:
+            self._close(stale_kind, *entry)
+        return resource
+
+    def _sweep(self, now: float) -> List[Tuple[str, Tuple[object, Optional[Callable]]]]:
+        """Vaxtı keçmiş sahibləri çıxarır; sahibsiz qalan resursları qaytarır (lock altında)"""
+        stale = []
+        for (kind, key), holders in list(self._holders.items()):
+            for holder, seen in list(holders.items()):
+                if now - seen > self.holder_ttl:
+                    del holders[holder]
+            if not holders:
+                del self._holders[(kind, key)]
+                entry = self._resources.pop((kind, key), None)
+                if entry is not None:
+                    stale.append((kind, entry))
+        return stale
+
+    def release(self, kind: str, key: str, holder: str):
+        """Sahibi çıxarır; resursu başqa sahib istifadə etmirsə bağlayır"""
+        with self._lock:
+            holders = self._holders.get((kind, key))
+            if holders is None:
+                return
+            holders.pop(holder, None)
+            if holders:
+                return
+            del self._holders[(kind, key)]
+            entry = self._resources.pop((kind, key), None)
+        if entry is not None:
+            self._close(kind, *entry)
+
+    @staticmethod
+    def _close(kind: str, resource, closer: Optional[Callable]):
+        if closer is None:
+            return
+        try:
+            closer(resource)
+            logger.info(f"Resource closed: {kind}")
+        except Exception as e:
+            logger.error(f"Resource close error ({kind}): {str(e)}")
+
+    def close_all(self):
+        with self._lock:
+            entries = list(self._resources.items())
+            self._resources.clear()
+            self._holders.clear()
+        for (kind, _), (resource, closer) in entries:
+            self._close(kind, resource, closer)
+
+
+_runner = None
+_runner_lock = threading.Lock()
+registry = ResourceRegistry()
+
+
+def get_async_runner() -> AsyncRunner:
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = AsyncRunner()
+        return _runner
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    return get_async_runner().run(coro)
+
+
+def get_session_resource(kind: str, credentials: tuple, factory: Callable[[], T],
+                         closer: Optional[Callable[[T], None]] = None) -> T:
+    """Sessiyanın cari etimadnamələrinə uyğun paylaşılan resursu qaytarır.
+
+    Sidebar-da açar dəyişdikdə sessiya köhnə açarın resursundan imtina
+    edir; bağlanmış sessiyalar isə RESOURCE_HOLDER_TTL-dən sonra sahib
+    sayılmır. Resurs yalnız onu heç bir sessiya istifadə etmədikdə (və ya
+    proses bitəndə) bağlanır.
+    """
+    key = ResourceRegistry.make_key(credentials)
+    holder = st.session_state.setdefault("_resource_holder", uuid.uuid4().hex)
+    keys = st.session_state.setdefault("_resource_keys", {})
+    resource = registry.acquire(kind, key, holder, factory, closer)
+    previous = keys.get(kind)
+    keys[kind] = key
+    if previous is not None and previous != key:
+        registry.release(kind, previous, holder)
+    return resource
+
+
+@atexit.register
+def _shutdown():
+    # Əvvəl resurslar (bəziləri bağlanmaq üçün loop-dan istifadə edir), sonra loop
+    registry.close_all()
+    if _runner is not None:
+        _runner.close()
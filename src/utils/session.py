@@ -19,6 +19,10 @@ class SessionManager:
             st.session_state['resume_text'] = ''
         if 'candidate_email' not in st.session_state:
             st.session_state['candidate_email'] = ''
+        if 'candidate_contacts' not in st.session_state:
+            st.session_state['candidate_contacts'] = {}
+        if 'pending_analysis' not in st.session_state:
+            st.session_state['pending_analysis'] = None
         if 'analysis_complete' not in st.session_state:
             st.session_state['analysis_complete'] = False
         if 'is_selected' not in st.session_state:
@@ -29,5 +33,7 @@ class SessionManager:
         """Reset all application related session state variables"""
         st.session_state['resume_text'] = ''
         st.session_state['candidate_email'] = ''
+        st.session_state['candidate_contacts'] = {}
+        st.session_state['pending_analysis'] = None
         st.session_state['analysis_complete'] = False
         st.session_state['is_selected'] = False
\ No newline at end of file
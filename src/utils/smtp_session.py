@@ -0,0 +1,163 @@
+import atexit
+import logging
+import smtplib
+import threading
+import time
+from email.message import Message
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bağlantı qopduqda bu xətalar yenidən qoşulma ilə bir dəfə təkrarlanır.
+# SMTPException özü OSError-dan törədiyi üçün OSError bura daxil edilmir,
+# əks halda məsələn rədd edilmiş alıcıya göndəriş təkrarlanardı
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class SMTPSession:
+    """Autentifikasiya olunmuş SMTP bağlantısını mesajlar arasında saxlayır.
+
+    Hər email üçün yeni TCP/TLS bağlantısı və LOGIN əvəzinə bir bağlantı
+    təkrar istifadə olunur. Bağlantı bir müddət boş qalıbsa göndərişdən
+    əvvəl NOOP ilə yoxlanılır, idle_timeout keçibsə yenidən açılır.
+    Metodlar bloklayandır və thread-safe-dir; event loop-dan
+    asyncio.to_thread ilə çağırılmalıdır.
+    """
+
+    def __init__(self, host: str, port: int, username: Optional[str], password: Optional[str],
+                 security: str = "starttls", timeout: float = 15, idle_timeout: float = 240,
+                 keepalive_interval: float = 30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.security = security
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+
+        self._server = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"connects": 0, "sent": 0, "reconnects": 0}
+
+    def _connect(self):
+        if self.security == "ssl":
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.security == "starttls":
+                server.starttls()
+                server.ehlo()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+
+        self._server = server
+        self._last_used = time.monotonic()
+        self._stats["connects"] += 1
+        logger.info(f"SMTP connection opened to {self.host}:{self.port}")
+
+    def _disconnect(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+
+    def _ensure_connected(self):
+        if self._server is None:
+            self._connect()
+            return
+
+        idle = time.monotonic() - self._last_used
+        if idle > self.idle_timeout:
+            self._disconnect()
+            self._connect()
+        elif idle > self.keepalive_interval:
+            try:
+                code, _ = self._server.noop()
+            except Exception:
+                code = None
+            if code != 250:
+                logger.info("SMTP keepalive failed, reconnecting")
+                self._server.close()
+                self._server = None
+                self._connect()
+
+    def _send_locked(self, msg: Message):
+        self._ensure_connected()
+        try:
+            self._server.send_message(msg)
+        except _CONNECTION_ERRORS as e:
+            # Server bağlantını bağlaya bilər; bir dəfə yenidən qoşulub təkrarlanır
+            logger.warning(f"SMTP connection lost ({str(e)}), reconnecting")
+            self._stats["reconnects"] += 1
+            if self._server is not None:
+                self._server.close()
+            self._server = None
+            self._connect()
+            self._server.send_message(msg)
+        self._last_used = time.monotonic()
+        self._stats["sent"] += 1
+
+    def send(self, msg: Message):
+        with self._lock:
+            self._send_locked(msg)
+
+    def send_many(self, messages: List[Message]) -> List[Optional[Exception]]:
+        """Mesajları bir bağlantı üzərindən göndərir; hər mesaj üçün xəta və ya None qaytarır"""
+        errors = []
+        with self._lock:
+            for msg in messages:
+                try:
+                    self._send_locked(msg)
+                    errors.append(None)
+                except smtplib.SMTPAuthenticationError:
+                    raise
+                except Exception as e:
+                    logger.error(f"SMTP error for {msg['To']}: {str(e)}")
+                    errors.append(e)
+        return errors
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+    def stats(self) -> Dict:
+        return dict(self._stats)
+
+
+_sessions: Dict[Tuple, SMTPSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_smtp_session(host: str, port: int, username: Optional[str], password: Optional[str],
+                     **options) -> SMTPSession:
+    """Eyni server və hesab üçün proses daxilində bir sessiya qaytarır.
+
+    Streamlit hər rerun-da EmailHandler-i yenidən yaratdığından bağlantı
+    handler-də deyil, burada saxlanılır.
+    """
+    key = (host, port, username, password, tuple(sorted(options.items())))
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = SMTPSession(host, port, username, password, **options)
+            _sessions[key] = session
+        return session
+
+
+@atexit.register
+def close_all_sessions():
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
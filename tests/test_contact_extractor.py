@@ -0,0 +1,65 @@
+import pytest
+
+from src.utils.contact_extractor import extract_contacts, is_valid_email
+
+
+def test_plain_contacts_are_extracted():
+    text = """Aysel Məmmədova
+    aysel.mammadova@gmail.com | +994 50 123 45 67
+    linkedin.com/in/aysel-m | https://github.com/aysel-m/portfolio
+    Experience 2019-2021"""
+    contacts = extract_contacts(text)
+    assert contacts["email"] == "aysel.mammadova@gmail.com"
+    assert not contacts["ambiguous"]
+    assert contacts["phones"] == ["+994501234567"]
+    assert contacts["linkedin"] == ["https://linkedin.com/in/aysel-m"]
+    assert contacts["github"] == ["https://github.com/aysel-m/portfolio"]
+
+
+def test_ocr_obfuscated_email_is_repaired():
+    assert extract_contacts("Email: orxan (at) gmai1.c0m")["email"] == "orxan@gmail.com"
+    assert extract_contacts("Email: orxan@gmail . com")["email"] == "orxan@gmail.com"
+    assert extract_contacts("orxan [at] mail [dot] ru")["email"] == "orxan@mail.ru"
+
+
+def test_placeholder_address_loses_to_real_one():
+    text = "Write to name@example.com\n...\nContact: leyla@box.az"
+    contacts = extract_contacts(text)
+    assert contacts["email"] == "leyla@box.az"
+    assert contacts["emails"] == ["leyla@box.az", "name@example.com"]
+
+
+def test_two_similar_candidates_are_ambiguous():
+    contacts = extract_contacts("a.b@company.az c.d@company.az\n" + "Experience " * 20)
+    assert contacts["ambiguous"]
+
+
+def test_date_ranges_and_reserved_github_paths_are_ignored():
+    contacts = extract_contacts("2019 - 2021\ngithub.com/features\n2015-2018")
+    assert contacts["phones"] == []
+    assert contacts["github"] == []
+    assert contacts["email"] is None
+
+
+@pytest.mark.parametrize("text", [
+    "03.2018 - 06.2020",
+    "01/2019 - 12/2021",
+    "2019 – 2021\n2017 - 2019",
+    "Python 3.10\n2018 2020 2022",
+    "Python 3.10 3.11 3.12",
+    "Student ID 201812345",
+])
+def test_dates_versions_and_ids_are_not_phones(text):
+    assert extract_contacts(text)["phones"] == []
+
+
+def test_local_phone_formats_are_kept():
+    text = "Tel: 050 123 45 67\nMobil: 0551234567\n(012) 497-12-34"
+    assert extract_contacts(text)["phones"] == ["0501234567", "0551234567", "0124971234"]
+
+
+def test_is_valid_email():
+    assert is_valid_email("a@b.co")
+    assert not is_valid_email("a..b@c.com")
+    assert not is_valid_email("a@b.c0m")
+    assert not is_valid_email("a@-b.com")
@@ -0,0 +1,191 @@
+import base64
+import socketserver
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+import pytest
+import pytz
+
+from src.core.email_handler import EmailHandler
+from src.core.email_outbox import EmailOutbox, make_idempotency_key, make_sender_key
+from src.core.interview_scheduler import SlotAllocator, parse_windows
+from src.utils.smtp_session import SMTPSession
+
+PASSWORD = "secret"
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP: AUTH PLAIN yalnız PASSWORD ilə, "bad" alıcısı üçün 550"""
+
+    def handle(self):
+        write = lambda line: self.wfile.write((line + "\r\n").encode())
+        write("220 test")
+        in_data = False
+        recipient = None
+        for raw in self.rfile:
+            line = raw.decode().rstrip("\r\n")
+            if in_data:
+                if line == ".":
+                    in_data = False
+                    self.server.delivered.append(recipient)
+                    write("250 ok")
+                continue
+            command = line.split(" ")[0].upper()
+            if command in ("EHLO", "HELO"):
+                write("250-test")
+                write("250 AUTH PLAIN")
+            elif command == "AUTH":
+                credentials = base64.b64decode(line.split(" ")[2]).split(b"\0")
+                write("235 ok" if credentials[-1].decode() == PASSWORD else "535 bad credentials")
+            elif command == "RCPT":
+                recipient = line.split("<")[1].rstrip(">")
+                write("550 no such user" if recipient.startswith("bad") else "250 ok")
+            elif command == "DATA":
+                in_data = True
+                write("354 go")
+            elif command == "QUIT":
+                write("221 bye")
+                return
+            else:
+                write("250 ok")
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.delivered = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    box = EmailOutbox(str(tmp_path / "outbox.sqlite3"), max_attempts=2, base_delay=0.01,
+                      max_delay=0.01, poll_interval=0.05, claim_timeout=60)
+    yield box
+    box.stop()
+
+
+def _register(outbox, server, password=PASSWORD):
+    host, port = server.server_address
+    session = SMTPSession(host, port, "hr@example.com", password, security="none", timeout=5)
+
+    def deliver(messages):
+        built = []
+        for to_email, subject, body in messages:
+            msg = EmailMessage()
+            msg["From"], msg["To"], msg["Subject"] = "hr@example.com", to_email, subject
+            msg.set_content(body)
+            built.append(msg)
+        return [str(error) if error else None for error in session.send_many(built)]
+
+    key = make_sender_key(host, port, "hr@example.com", password)
+    outbox.register_sender("hr@example.com", key, deliver)
+    return key
+
+
+def _enqueue(outbox, key, to_email, email_type="selection"):
+    return outbox.enqueue("hr@example.com", key, to_email, email_type, "Mövzu", "Mətn",
+                          make_idempotency_key(to_email, "backend_engineer", email_type))
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_same_key_is_delivered_once(outbox, smtp_server):
+    key = _register(outbox, smtp_server)
+    first = _enqueue(outbox, key, "ali@example.com")
+    assert _wait_for(lambda: outbox.status(first["idempotency_key"])["status"] == "sent")
+
+    again = _enqueue(outbox, key, "ali@example.com")
+    time.sleep(0.2)
+    assert again["id"] == first["id"]
+    assert smtp_server.delivered == ["ali@example.com"]
+
+
+def test_refused_recipient_ends_failed_after_max_attempts(outbox, smtp_server):
+    key = _register(outbox, smtp_server)
+    record = _enqueue(outbox, key, "bad@example.com")
+    assert _wait_for(lambda: outbox.status(record["idempotency_key"])["status"] == "failed")
+
+    status = outbox.status(record["idempotency_key"])
+    assert status["attempts"] == 2
+    assert "550" in status["last_error"]
+    assert smtp_server.delivered == []
+
+
+def test_only_stale_claims_are_requeued(tmp_path, smtp_server):
+    db_path = str(tmp_path / "outbox.sqlite3")
+    host, port = smtp_server.server_address
+    key = make_sender_key(host, port, "hr@example.com", PASSWORD)
+    EmailOutbox(db_path)
+    with sqlite3.connect(db_path) as conn:
+        now = time.time()
+        for to_email, claimed_at in (("stale@example.com", now - 120), ("active@example.com", now)):
+            conn.execute(
+                "INSERT INTO outbox (idempotency_key, sender, sender_key, to_email, email_type, subject, body,"
+                " status, next_attempt_at, claimed_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (to_email, "hr@example.com", key, to_email, "selection", "Mövzu", "Mətn", "sending", now,
+                 claimed_at, now)
+            )
+
+    # Yeni proses: davam edən göndərişə toxunulmamalıdır
+    box = EmailOutbox(db_path, poll_interval=0.05, claim_timeout=60)
+    try:
+        _register(box, smtp_server)
+        assert _wait_for(lambda: box.status("stale@example.com")["status"] == "sent")
+        time.sleep(0.2)
+        assert box.status("active@example.com")["status"] == "sending"
+        assert smtp_server.delivered == ["stale@example.com"]
+    finally:
+        box.stop()
+
+
+def test_wrong_password_session_does_not_take_over(outbox, smtp_server):
+    key = _register(outbox, smtp_server)
+    record = _enqueue(outbox, key, "ali@example.com")
+    wrong_key = _register(outbox, smtp_server, password="wrong")
+    wrong = _enqueue(outbox, wrong_key, "vali@example.com")
+
+    assert wrong_key != key
+    assert _wait_for(lambda: outbox.status(record["idempotency_key"])["status"] == "sent")
+    assert _wait_for(lambda: outbox.status(wrong["idempotency_key"])["status"] == "failed")
+    assert smtp_server.delivered == ["ali@example.com"]
+
+
+def test_rebooked_interview_gets_new_confirmation(outbox, tmp_path):
+    tz = pytz.timezone("Asia/Baku")
+    now = tz.localize(datetime(2026, 10, 19, 8, 0))
+    allocator = SlotAllocator(
+        db_path=str(tmp_path / "interviews.sqlite3"), windows=parse_windows("10:00-12:00"),
+        workdays=[0, 1, 2, 3, 4], slot_minutes=45, buffer_minutes=15, holidays=[],
+        horizon_days=7, min_notice_hours=1, timezone="Asia/Baku"
+    )
+    handler = EmailHandler.__new__(EmailHandler)
+    handler.sender_email, handler.sender_key, handler.outbox = "hr@example.com", "key", outbox
+
+    def confirm(booking):
+        details = {"date": booking["start"].strftime("%Y-%m-%d"), "time": booking["start"].strftime("%H:%M"),
+                   "join_url": "https://zoom.us/j/1"}
+        return handler.enqueue_interview_confirmation("ali@example.com", "backend", details, booking["id"])
+
+    first = allocator.allocate(["ali@example.com"], "backend", now=now)[0]
+    assert confirm(first)["id"] == confirm(first)["id"]
+
+    # Birinci müsahibə keçib, namizəd yenidən rezervasiya olunur
+    second = allocator.allocate(["ali@example.com"], "backend", now=now + timedelta(days=14))[0]
+    assert second["id"] != first["id"]
+    assert confirm(second)["id"] != confirm(first)["id"]
+    assert len(outbox.statuses_for("ali@example.com")) == 2
@@ -0,0 +1,98 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.core import groq_agent
+from src.core.groq_agent import GroqAgent
+
+
+def _agent(answer, finish_reason="stop"):
+    agent = GroqAgent(api_key="test")
+    agent.cascade = True
+    agent.uncertainty_band = (40, 80)
+
+    async def chat(**kwargs):
+        content = answer if isinstance(answer, str) else json.dumps(answer, ensure_ascii=False)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)])
+
+    agent._chat = chat
+    return agent
+
+
+def _triage(agent):
+    meta = {"tier": None, "latency": {}}
+    result = asyncio.run(agent._triage({"messages": [], "model": agent.model}, False, meta))
+    return result, meta
+
+
+def _answer(score, decision):
+    return {
+        "uyğunluq_faizi": str(score),
+        "qərar": decision,
+        "güclü_tərəflər": [],
+        "zəif_tərəflər": [],
+        "məsləhətlər": [],
+        "təhlil": "-"
+    }
+
+
+@pytest.mark.parametrize("score, decision", [(92, "qəbul"), (15, "rədd")])
+def test_triage_decides_outside_band(score, decision):
+    result, meta = _triage(_agent(_answer(score, decision)))
+    assert result["qərar"] == decision
+    assert meta["tier"] == "triage"
+
+
+@pytest.mark.parametrize("score, decision", [(92, "rədd"), (15, "qəbul")])
+def test_triage_escalates_on_contradicting_decision(score, decision):
+    result, meta = _triage(_agent(_answer(score, decision)))
+    assert result is None
+    assert meta["tier"] is None
+
+
+def test_triage_escalates_inside_band():
+    result, _ = _triage(_agent(_answer(60, "qəbul")))
+    assert result is None
+
+
+class _MemoryCache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def stats(self):
+        return {}
+
+
+def _analyze(agent, monkeypatch):
+    cache = _MemoryCache()
+    monkeypatch.setattr(groq_agent, "analysis_cache", cache)
+    agent.cascade = False
+    return asyncio.run(agent.analyze_resume("Python developer", "backend_engineer")), cache
+
+
+def test_complete_analysis_is_cached(monkeypatch):
+    result, cache = _analyze(_agent(_answer(60, "qəbul")), monkeypatch)
+    assert result["qərar"] == "qəbul"
+    assert len(cache.data) == 1
+
+
+def test_truncated_analysis_is_not_cached(monkeypatch):
+    text = json.dumps(_answer(60, "qəbul"), ensure_ascii=False)[:-2]
+    result, cache = _analyze(_agent(text), monkeypatch)
+    assert result["_meta"]["truncated"]
+    assert cache.data == {}
+
+
+def test_length_finish_reason_is_not_cached(monkeypatch):
+    result, cache = _analyze(_agent(_answer(60, "qəbul"), finish_reason="length"), monkeypatch)
+    assert result["_meta"]["truncated"]
+    assert cache.data == {}
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from src.core.interview_scheduler import SlotAllocator, parse_windows
+
+TZ = pytz.timezone("Asia/Baku")
+# Bazar ertəsi, səhər
+NOW = TZ.localize(datetime(2026, 10, 19, 8, 0))
+
+
+@pytest.fixture
+def allocator(tmp_path):
+    return SlotAllocator(
+        db_path=str(tmp_path / "interviews.sqlite3"),
+        windows=parse_windows("10:00-12:00"),
+        workdays=[0, 1, 2, 3, 4],
+        slot_minutes=45,
+        buffer_minutes=15,
+        holidays=[],
+        horizon_days=7,
+        min_notice_hours=1,
+        timezone="Asia/Baku"
+    )
+
+
+def test_parse_windows():
+    assert parse_windows("14:00-17:00, 10:00-12:30") == [(600, 750), (840, 1020)]
+
+
+def test_candidates_get_distinct_earliest_slots(allocator):
+    bookings = allocator.allocate(["a@x.az", "B@x.az ", "c@x.az"], "backend", now=NOW)
+    starts = [booking["start"] for booking in bookings]
+    assert starts == [
+        TZ.localize(datetime(2026, 10, 19, 10, 0)),
+        TZ.localize(datetime(2026, 10, 19, 11, 0)),
+        TZ.localize(datetime(2026, 10, 20, 10, 0)),
+    ]
+    assert bookings[1]["candidate_email"] == "b@x.az"
+    assert all(b["end"] - b["start"] == timedelta(minutes=45) for b in bookings)
+
+
+def test_rebooking_returns_existing_slot(allocator):
+    first = allocator.allocate(["a@x.az"], "backend", now=NOW)[0]
+    again = allocator.allocate(["a@x.az"], "backend", now=NOW + timedelta(minutes=5))[0]
+    assert again["id"] == first["id"]
+    other_role = allocator.allocate(["a@x.az"], "frontend", now=NOW)[0]
+    assert other_role["id"] != first["id"]
+    assert other_role["start"] != first["start"]
+
+
+def test_past_booking_is_not_returned(allocator):
+    first = allocator.allocate(["a@x.az"], "backend", now=NOW)[0]
+    later = NOW + timedelta(days=14)
+    again = allocator.allocate(["a@x.az"], "backend", now=later)[0]
+    assert again["id"] != first["id"]
+    assert again["start"] > later
+
+
+def test_released_slot_is_reused(allocator):
+    first = allocator.allocate(["a@x.az"], "backend", now=NOW)[0]
+    allocator.release(first["id"])
+    second = allocator.allocate(["b@x.az"], "backend", now=NOW)[0]
+    assert second["start"] == first["start"]
+
+
+def test_no_free_slot_returns_none(tmp_path):
+    allocator = SlotAllocator(
+        db_path=str(tmp_path / "interviews.sqlite3"), windows=[(600, 660)], workdays=[0],
+        slot_minutes=60, buffer_minutes=0, holidays=[], horizon_days=0, min_notice_hours=0,
+        timezone="Asia/Baku"
+    )
+    assert allocator.allocate(["a@x.az", "b@x.az"], "backend", now=NOW)[1] is None
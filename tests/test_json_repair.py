@@ -0,0 +1,47 @@
+import pytest
+
+from src.utils.json_repair import StreamingJSONParser, parse_json_checked, parse_json_lenient
+
+
+def test_fenced_response_keeps_smart_quotes_inside_strings():
+    text = '```json\n{"təhlil": "Namizəd “Python” üzrə güclüdür", "uyğunluq_faizi": 82}\n```'
+    assert parse_json_lenient(text) == {"təhlil": "Namizəd “Python” üzrə güclüdür", "uyğunluq_faizi": 82}
+
+
+def test_trailing_comma_pattern_inside_string_is_preserved():
+    text = 'Cavab: {"qeyd": "x, ]", "siyahı": [1, 2,],}'
+    assert parse_json_lenient(text) == {"qeyd": "x, ]", "siyahı": [1, 2]}
+
+
+def test_trailing_commas_outside_strings_are_removed():
+    text = '{"a": [1, 2, ], "b": {"c": 3,\n},\n}'
+    assert parse_json_lenient(text) == {"a": [1, 2], "b": {"c": 3}}
+
+
+def test_smart_quote_delimiters_are_repaired():
+    text = '{“qərar”: “qəbul”, "təhlil": "“Go” bilir",}'
+    assert parse_json_lenient(text) == {"qərar": "qəbul", "təhlil": "“Go” bilir"}
+
+
+def test_truncated_response_is_closed():
+    assert parse_json_lenient('{"uyğunluq_faizi": 70, "təhlil": "yarım') == {
+        "uyğunluq_faizi": 70, "təhlil": "yarım"
+    }
+
+
+def test_non_json_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_json_lenient("JSON yoxdur")
+
+
+def test_streaming_parser_emits_completed_fields():
+    parser = StreamingJSONParser()
+    assert parser.feed('```json\n{"uyğunluq_faizi": 8') == {}
+    assert parser.feed('5, "qərar": "qə') == {"uyğunluq_faizi": 85}
+    assert parser.feed('bul"}') == {"qərar": "qəbul"}
+
+
+def test_checked_parse_reports_truncation():
+    assert parse_json_checked('{"a": 1}') == ({"a": 1}, False)
+    assert parse_json_checked('```json\n{"a": 1,}\n```') == ({"a": 1}, False)
+    assert parse_json_checked('{"a": 1, "təhlil": "yarım') == ({"a": 1, "təhlil": "yarım"}, True)
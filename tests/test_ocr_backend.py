@@ -0,0 +1,55 @@
+import os
+import stat
+import sys
+
+import pytest
+from PIL import Image
+
+from src.utils.ocr_backend import TesseractBatchBackend
+
+# Tesseract əvəzinə: siyahıdakı hər şəkil üçün "page N" (ağ şəkil üçün boş mətn) yazır.
+# MODE: between - ayırıcı səhifələr arasında, after - hər səhifədən sonra, none - ayırıcısız
+_FAKE_TESSERACT = '''
+import os, sys
+from PIL import Image
+paths = open(sys.argv[1]).read().split()
+separator = sys.argv[sys.argv.index("-c") + 1].split("=", 1)[1]
+mode = os.environ["FAKE_TESSERACT_MODE"]
+texts = ["" if Image.open(p).getextrema() == (255, 255) else "page " + p[-8:-4] + "\\n" for p in paths]
+if mode == "between" or len(paths) == 1:
+    out = separator.join(texts)
+elif mode == "after":
+    out = "".join(t + separator for t in texts)
+else:
+    out = "".join(texts)
+sys.stdout.write(out)
+'''
+
+
+@pytest.fixture
+def backend(tmp_path):
+    script = tmp_path / "tesseract"
+    script.write_text(f"#!{sys.executable}\n{_FAKE_TESSERACT}")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return TesseractBatchBackend(str(script))
+
+
+def _pages(blank_last=False):
+    images = [Image.new("L", (8, 8), 0) for _ in range(3)]
+    if blank_last:
+        images[-1] = Image.new("L", (8, 8), 255)
+    return images
+
+
+@pytest.mark.parametrize("mode", ["between", "after"])
+@pytest.mark.parametrize("blank_last", [False, True])
+def test_pages_are_split_by_separator_count(backend, monkeypatch, mode, blank_last):
+    monkeypatch.setenv("FAKE_TESSERACT_MODE", mode)
+    pages = backend.ocr_batch(_pages(blank_last))
+    assert pages[:2] == ["page 0000\n", "page 0001\n"]
+    assert pages[2] == ("" if blank_last else "page 0002\n")
+
+
+def test_unexpected_separator_count_falls_back_to_per_page(backend, monkeypatch):
+    monkeypatch.setenv("FAKE_TESSERACT_MODE", "none")
+    assert backend.ocr_batch(_pages(blank_last=True)) == ["page 0000\n", "page 0000\n", ""]
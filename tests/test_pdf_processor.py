@@ -0,0 +1,26 @@
+import pytest
+from PIL import Image
+
+from src.utils import pdf_processor
+from src.utils.pdf_processor import PDFDocument
+
+
+def test_render_raises_when_pdftoppm_returns_fewer_pages(monkeypatch):
+    monkeypatch.setattr(
+        pdf_processor, "convert_from_bytes",
+        lambda data, first_page, last_page, **kwargs: [Image.new("L", (4, 4))] * (last_page - first_page)
+    )
+    document = PDFDocument(b"%PDF-1.4", dpi=72)
+    with pytest.raises(RuntimeError):
+        document.render([1, 2, 3])
+
+
+def test_render_maps_images_to_requested_pages(monkeypatch):
+    monkeypatch.setattr(
+        pdf_processor, "convert_from_bytes",
+        lambda data, first_page, last_page, **kwargs: [
+            Image.new("L", (n, n)) for n in range(first_page, last_page + 1)
+        ]
+    )
+    document = PDFDocument(b"%PDF-1.4", dpi=72)
+    assert [image.size[0] for image in document.render([2, 3, 5])] == [2, 3, 5]
@@ -0,0 +1,68 @@
+from src.core.prescreening import PreScreener
+
+REQUIREMENTS = {
+    "backend": """
+        Required Skills:
+        - Proficiency in Python, Java, or Node.js
+        - Authentication mechanisms (OAuth, JWT)
+        - Containerization using Docker and Kubernetes
+        - Strong problem-solving skills
+    """,
+    "frontend": """
+        Required Skills:
+        - React or Vue.js
+    """
+}
+
+
+def test_any_skill_satisfies_a_requirement_line():
+    screener = PreScreener(REQUIREMENTS)
+    result = screener.evaluate("Java developer. Docker. OAuth", "backend")
+    assert result["score"] == 1.0
+    assert result["missing"] == []
+    assert result["matched"] == ["java", "oauth", "docker"]
+
+
+def test_missing_lists_unmet_lines():
+    screener = PreScreener(REQUIREMENTS)
+    result = screener.evaluate("Python", "backend")
+    assert result["missing"] == ["oauth / jwt", "docker / kubernetes"]
+    assert abs(result["score"] - 1 / 3) < 1e-6
+
+
+def test_slash_separates_skills():
+    screener = PreScreener(REQUIREMENTS)
+    assert screener.evaluate("Auth: OAuth2/JWT", "backend")["matched"] == ["oauth", "jwt"]
+
+
+def test_score_matrix_matches_evaluate():
+    screener = PreScreener(REQUIREMENTS)
+    texts = ["Node.js, Kubernetes", "React"]
+    matrix = screener.score_matrix(texts)
+    assert matrix.shape == (2, 2)
+    for row, text in enumerate(texts):
+        for column, role in enumerate(screener.roles):
+            assert abs(matrix[row, column] - screener.evaluate(text, role)["score"]) < 1e-6
+
+
+def test_thresholds_set_decision():
+    screener = PreScreener(REQUIREMENTS, reject_below=0.3, shortlist_above=0.9)
+    assert screener.evaluate("nothing relevant", "backend")["decision"] == "rədd"
+    assert screener.evaluate("Python, JWT, Docker", "backend")["decision"] == "qəbul"
+    assert screener.evaluate("Python, JWT", "backend")["decision"] is None
+
+
+def test_everyday_words_are_not_skills():
+    text = """
+        Store manager with eight years in retail and logistics. Ran the express
+        delivery desk and the regional distribution node, tracked shipping
+        containers at the port and was at the helm of a team of twelve.
+        Responsive to customer complaints and quick to react under pressure.
+        Took a rest year in 2019. Member of Lambda Chi Alpha. Interests: physics
+        (angular momentum), ML 5 km runs, JS Group volunteering, TS certificate.
+    """
+    screener = PreScreener()
+    for role in screener.roles:
+        result = screener.evaluate(text, role)
+        assert result["matched"] == []
+        assert result["score"] == 0.0
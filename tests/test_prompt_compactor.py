@@ -0,0 +1,52 @@
+from src.utils.prompt_compactor import compact_resume, estimate_tokens, normalize_text
+
+
+def test_short_tech_names_are_not_garbage():
+    text = "Skills\nC++\nC#\n.NET\nR\nC++ / C# / .NET / R\n~~ | ¦"
+    lines = normalize_text(text).splitlines()
+    assert lines == ["Skills", "C++", "C#", ".NET", "R", "C++ / C# / .NET / R"]
+
+
+def test_repeated_lines_inside_page_are_kept():
+    text = "\n".join([
+        "Backend Developer",
+        "- Built REST APIs",
+        "Backend Developer",
+        "- Built REST APIs",
+    ])
+    assert normalize_text(text).splitlines().count("Backend Developer") == 2
+    assert normalize_text(text).splitlines().count("- Built REST APIs") == 2
+
+
+def test_page_boundary_header_and_footer_are_deduplicated():
+    page = "Jane Doe | jane@example.com\n{body}\nConfidential\n{number}"
+    text = "\f".join([
+        page.format(body="Experience\n- Python", number="1"),
+        page.format(body="- Python\nEducation", number="2"),
+    ])
+    lines = normalize_text(text).splitlines()
+    assert lines.count("Jane Doe | jane@example.com") == 1
+    assert lines.count("Confidential") == 1
+    assert lines.count("- Python") == 2
+    assert "2" not in lines
+
+
+def test_under_budget_text_is_normalized_but_not_dropped():
+    text = "Summary\nC++ developer\n\n\nC++ developer\n1\f~~"
+    compacted, stats = compact_resume(text, estimate_tokens(text))
+    assert compacted == "Summary\nC++ developer\n\nC++ developer"
+    assert stats["dropped_sections"] == []
+    assert stats["tokens_after"] < stats["tokens_before"]
+
+
+def test_over_budget_drops_low_priority_sections_first():
+    text = "\n".join([
+        "Experience",
+        "- Python developer at Example, 2019-2024",
+        "Interests",
+        "chess, hiking, photography, travelling, reading, cooking " * 5,
+    ])
+    compacted, stats = compact_resume(text, 30)
+    assert stats["dropped_sections"] == ["interests"]
+    assert "Python developer" in compacted
+    assert stats["tokens_after"] <= 30
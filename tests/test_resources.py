@@ -0,0 +1,46 @@
+from src.utils.resources import ResourceRegistry
+
+
+def test_resource_is_closed_when_last_holder_releases():
+    registry = ResourceRegistry()
+    closed = []
+    factory = lambda: object()
+
+    first = registry.acquire("groq", "key", "session-a", factory, closed.append)
+    assert registry.acquire("groq", "key", "session-b", factory, closed.append) is first
+
+    registry.release("groq", "key", "session-a")
+    assert closed == []
+    assert registry.acquire("groq", "key", "session-c", factory, closed.append) is first
+
+    registry.release("groq", "key", "session-b")
+    registry.release("groq", "key", "session-c")
+    assert closed == [first]
+    assert registry.acquire("groq", "key", "session-a", factory, closed.append) is not first
+
+
+def test_close_all_closes_everything():
+    registry = ResourceRegistry()
+    closed = []
+    registry.acquire("smtp", "a", "session-a", lambda: "a", closed.append)
+    registry.get("app", "", lambda: "app", closed.append)
+    registry.close_all()
+    assert sorted(closed) == ["a", "app"]
+
+
+def test_stale_holders_are_swept_on_acquire():
+    registry = ResourceRegistry(holder_ttl=60)
+    closed = []
+
+    old = registry.acquire("groq", "old-key", "closed-tab", lambda: "old", closed.append, now=0)
+    shared = registry.acquire("groq", "key", "closed-tab", lambda: "shared", closed.append, now=0)
+    registry.acquire("groq", "key", "active-tab", lambda: "shared", closed.append, now=50)
+    assert closed == []
+
+    # Bağlanmış tab heç vaxt release etmir: TTL keçəndən sonra sahib sayılmır
+    registry.acquire("smtp", "a", "active-tab", lambda: "smtp", closed.append, now=100)
+    assert closed == [old]
+    assert registry.acquire("groq", "key", "active-tab", lambda: "new", closed.append, now=100) is shared
+
+    registry.acquire("smtp", "a", "active-tab", lambda: "smtp", closed.append, now=150)
+    assert closed == [old]